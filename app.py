@@ -1,13 +1,28 @@
+import logging
+import threading
+import time
+
 from dash import Dash, html, dcc, Input, Output, callback
 import dash_bootstrap_components as dbc
+from flask import jsonify
+
+from data.cache import CACHES
+
+from data.loader import STARTUP_MODE, filter_data, get_catalogs, load_dataset
+from data.stewards import steward_permutation_test
 
-from data.loader import load_data, get_unique_values, get_unique_stewards, get_unique_outcomes
 from components.navbar import create_navbar
 from components.filters import create_filter_button, create_filter_offcanvas, create_active_filters_display
 from layouts import overview, drivers, teams, races, stewards, compare, raw_data
 from callbacks.callbacks import register_callbacks
+from routes.admin import register_admin_routes
+from routes.export import register_export_routes
+from routes.metrics import register_metrics_routes
+from routes.traces import register_trace_recording
 
 
+logger = logging.getLogger(__name__)
+
 app = Dash(
     __name__,
     title="F1 Penalties",
@@ -23,42 +38,46 @@ app = Dash(
 
 server = app.server
 
-df = load_data()
-years = sorted(get_unique_values(df, "Year"), reverse=True)
-races_list = get_unique_values(df, "Race")
-sessions = get_unique_values(df, "Session")
-drivers_list = get_unique_values(df, "Driver")
-teams_list = get_unique_values(df, "Team")
-allegations = get_unique_values(df, "Allegation")
-outcomes = get_unique_outcomes(df)
-stewards_list = get_unique_stewards(df)
 
+@server.route("/cache-stats")
+def cache_stats():
+    return jsonify([cache.info() for cache in CACHES])
 
-app.layout = html.Div([
-    dcc.Store(id="filter-store", data={}),
-    dcc.Location(id="url", refresh=False),
-    
-    create_navbar(),
-    
-    dbc.Container([
-        dbc.Row([
-            dbc.Col([
-                create_filter_button(),
-                create_active_filters_display(),
-            ], xs=12, className="mt-3"),
-        ]),
-    ], fluid=True),
-    
-    create_filter_offcanvas(
-        years, races_list, sessions, drivers_list, teams_list, allegations, outcomes, stewards_list
-    ),
-    
-    html.Div(id="page-content"),
 
-    html.Footer(
-    html.Small("Created by Jessica Steele", className="text-muted"),
-    className="text-center py-3 mt-4"),
-])
+register_admin_routes(server)
+register_export_routes(server)
+register_metrics_routes(server)
+register_trace_recording(server)
+
+
+def create_layout(catalogs):
+    return html.Div([
+        dcc.Store(id="filter-store", data={}),
+        dcc.Location(id="url", refresh=False),
+        
+        create_navbar(),
+        
+        dbc.Container([
+            dbc.Row([
+                dbc.Col([
+                    create_filter_button(),
+                    create_active_filters_display(),
+                ], xs=12, className="mt-3"),
+            ]),
+        ], fluid=True),
+        
+        create_filter_offcanvas(
+            sorted(catalogs["years"], reverse=True), catalogs["races"], catalogs["sessions"],
+            catalogs["drivers"], catalogs["teams"], catalogs["allegations"], catalogs["outcomes"],
+            catalogs["stewards"],
+        ),
+        
+        html.Div(id="page-content"),
+
+        html.Footer(
+        html.Small("Created by Jessica Steele", className="text-muted"),
+        className="text-center py-3 mt-4"),
+    ])
 
 
 @callback(
@@ -66,26 +85,73 @@ app.layout = html.Div([
     Input("url", "pathname"),
 )
 def display_page(pathname):
+    catalogs = get_catalogs()
     if pathname == "/" or pathname == "/overview":
         return overview.create_layout()
     elif pathname == "/drivers":
-        return drivers.create_layout(drivers_list)
+        return drivers.create_layout(catalogs["drivers"])
     elif pathname == "/teams":
-        return teams.create_layout(teams_list)
+        return teams.create_layout(catalogs["teams"])
     elif pathname == "/races":
-        return races.create_layout(years, races_list)
+        return races.create_layout(sorted(catalogs["years"], reverse=True), catalogs["races"])
     elif pathname == "/stewards":
-        return stewards.create_layout(stewards_list)
+        return stewards.create_layout(catalogs["stewards"])
     elif pathname == "/compare":
-        return compare.create_layout(drivers_list, teams_list)
+        return compare.create_layout(catalogs["drivers"], catalogs["teams"])
     elif pathname == "/data":
         return raw_data.create_layout()
     else:
         return overview.create_layout()
 
 
-register_callbacks(app)
+def warm_statistics():
+    # The steward permutation test is the costliest thing a callback computes;
+    # run it for the unfiltered selection before anyone opens the page.
+    steward_permutation_test(filter_data(load_dataset().df, {}))
+
+
+def warm_up():
+    # Build the lazy indexes and pull in the heavy modules the first chart
+    # requests need, off the startup path.
+    start = time.perf_counter()
+    load_dataset().warm()
+    import scipy.stats
+    import plotly.express
+    warm_statistics()
+    logger.info("Background warm-up finished in %.3fs", time.perf_counter() - start)
+
+
+def startup():
+    # Load the data and build the layout, logging how long each phase took.
+    phases = [("start", time.perf_counter())]
+    load_dataset()
+    phases.append(("dataset", time.perf_counter()))
+    
+    catalogs = get_catalogs()
+    phases.append(("catalogs", time.perf_counter()))
+    
+    app.layout = create_layout(catalogs)
+    register_callbacks(app)
+    phases.append(("layout and callbacks", time.perf_counter()))
+    
+    if STARTUP_MODE == "eager":
+        warm_statistics()
+        phases.append(("statistics", time.perf_counter()))
+    
+    logger.info(
+        "Startup (%s) took %.3fs: %s",
+        STARTUP_MODE,
+        phases[-1][1] - phases[0][1],
+        ", ".join(f"{name} {end - begin:.3f}s" for (_, begin), (name, end) in zip(phases, phases[1:])),
+    )
+    
+    if STARTUP_MODE == "lazy":
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+
+startup()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     app.run_server(debug=True)
@@ -0,0 +1,88 @@
+import argparse
+
+import pandas as pd
+
+from benchmarks.common import best_of, load_raw_frame, scale_frame
+from data.loader import (
+    DRIVER_NAME_MAP, TEAM_NAME_MAP, INVALID_DRIVERS, STRIP_COLUMNS,
+    clean_data, parse_outcomes, parse_stewards, standardize_allegation,
+    standardize_outcome_string,
+)
+
+
+def legacy_clean_data(df):
+    df = df.copy()
+    
+    for col in STRIP_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].apply(lambda x: str(x).strip() if pd.notna(x) else x)
+    
+    df["Year"] = pd.to_numeric(df["Year"], errors="coerce").astype("Int64")
+    df["Round"] = pd.to_numeric(df["Round"], errors="coerce").astype("Int64")
+    df["Penalty Points"] = pd.to_numeric(df["Penalty Points"], errors="coerce").astype("Int64")
+    df["Time Penalty (in seconds)"] = pd.to_numeric(df["Time Penalty (in seconds)"], errors="coerce")
+    df["Fine"] = pd.to_numeric(df["Fine"], errors="coerce")
+    
+    df = legacy_apply_grid_penalty_from_outcome(df)
+    
+    df["Driver"] = df["Driver"].replace(DRIVER_NAME_MAP)
+    df["Team"] = df["Team"].replace(TEAM_NAME_MAP)
+    df["Incident involving"] = df["Incident involving"].replace(DRIVER_NAME_MAP)
+    
+    df["Allegation"] = df["Allegation"].apply(standardize_allegation)
+    df["Outcome"] = df["Outcome"].apply(standardize_outcome_string)
+    
+    df = df[~df["Driver"].isin(INVALID_DRIVERS)]
+    
+    if "Stewards" not in df.columns:
+        df["Stewards"] = None
+    
+    df["Stewards_List"] = df["Stewards"].apply(parse_stewards)
+    df["Outcome_List"] = df["Outcome"].apply(parse_outcomes)
+    
+    return df
+
+
+def legacy_apply_grid_penalty_from_outcome(df):
+    for idx, row in df.iterrows():
+        if pd.notna(row.get("Outcome")):
+            outcome_lower = str(row["Outcome"]).lower()
+            if "start from back of grid" in outcome_lower:
+                df.at[idx, "Grid Penalty"] = 19
+            elif "start from pit lane" in outcome_lower:
+                df.at[idx, "Grid Penalty"] = "Pit Lane"
+        
+        if pd.notna(row.get("Grid Penalty")):
+            gp = row["Grid Penalty"]
+            if isinstance(gp, str):
+                gp_lower = gp.lower()
+                if gp_lower == "pit lane":
+                    df.at[idx, "Grid Penalty"] = "Pit Lane"
+                elif gp_lower == "back of starting grid":
+                    df.at[idx, "Grid Penalty"] = 19
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark clean_data against the row-wise implementation.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--legacy-limit", type=int, default=100_000,
+                        help="Skip the row-wise implementation above this many rows.")
+    args = parser.parse_args()
+    
+    raw = load_raw_frame()
+    
+    print(f"{'rows':>10} {'vectorized rows/s':>18} {'legacy rows/s':>14}")
+    for size in args.sizes:
+        scaled = scale_frame(raw, size)
+        seconds, _ = best_of(lambda: clean_data(scaled))
+        if size <= args.legacy_limit:
+            legacy_seconds, _ = best_of(lambda: legacy_clean_data(scaled), repeat=1)
+            legacy_rate = f"{size / legacy_seconds:14,.0f}"
+        else:
+            legacy_rate = f"{'skipped':>14}"
+        print(f"{size:>10,} {size / seconds:18,.0f} {legacy_rate}")
+
+
+if __name__ == "__main__":
+    main()
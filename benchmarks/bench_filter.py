@@ -0,0 +1,67 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.common import best_of, scale_frame, with_list_columns
+from data.loader import filter_data, load_data, use_dataset
+
+
+FILTER_SETS = {
+    "none": {},
+    "single year": {"years": [2023]},
+    "driver + team": {"drivers": ["Max Verstappen", "Lewis Hamilton"], "teams": ["Red Bull", "Mercedes"]},
+    "steward + outcome": {"stewards": ["Garry Connelly", "Tim Mayer"], "outcomes": ["Penalty Points"]},
+    "everything": {
+        "years": [2021, 2022, 2023],
+        "races": ["Monaco", "Austria", "Italy", "Brazil"],
+        "sessions": ["R", "Q"],
+        "teams": ["Ferrari", "Red Bull", "McLaren", "Haas"],
+        "allegations": ["Causing a Collision", "Pit Lane Speeding"],
+        "outcomes": ["Time Penalty", "Fine"],
+        "stewards": ["Garry Connelly", "Tim Mayer", "Derek Warwick"],
+    },
+}
+
+
+def legacy_filter_data(df, filters):
+    filtered = df.copy()
+    for key, column in [("years", "Year"), ("races", "Race"), ("sessions", "Session"),
+                        ("drivers", "Driver"), ("teams", "Team"), ("allegations", "Allegation")]:
+        if filters.get(key):
+            filtered = filtered[filtered[column].isin(filters[key])]
+    if filters.get("outcomes"):
+        mask = filtered["Outcome_List"].apply(lambda x: any(o in x for o in filters["outcomes"]))
+        filtered = filtered[mask]
+    if filters.get("stewards"):
+        mask = filtered["Stewards_List"].apply(lambda x: any(s in x for s in filters["stewards"]))
+        filtered = filtered[mask]
+    return filtered
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark filter_data against the mask-chain implementation.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+    
+    base = load_data()
+    print(f"{'rows':>10} {'filter set':<18} {'legacy ms':>10} {'bitmap ms':>10} {'speedup':>8}")
+    for size in args.sizes:
+        scaled = scale_frame(base, size)
+        start = time.perf_counter()
+        dataset = use_dataset(scaled, f"bench-{size}")
+        build_seconds = time.perf_counter() - start
+        df = dataset.df
+        legacy_df = with_list_columns(df)
+        
+        for name, filters in FILTER_SETS.items():
+            legacy_seconds, expected = best_of(lambda: legacy_filter_data(legacy_df, filters))
+            seconds, actual = best_of(lambda: filter_data(df, filters))
+            assert np.array_equal(expected.index.to_numpy(), actual.index.to_numpy()), name
+            print(f"{size:>10,} {name:<18} {legacy_seconds * 1000:10.1f} {seconds * 1000:10.1f} "
+                  f"{legacy_seconds / seconds:7.1f}x")
+        print(f"{size:>10,} index build {build_seconds:.2f}s, bitmaps {dataset.bitmaps.nbytes / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
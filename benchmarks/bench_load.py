@@ -0,0 +1,527 @@
+import argparse
+import itertools
+import json
+import logging
+import math
+import platform
+import random
+import signal
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_suite import git_revision
+from benchmarks.bench_workers import serve
+
+
+DISPATCH_PATH = "/_dash-update-component"
+PAGES = ["/", "/drivers", "/teams", "/races", "/stewards", "/compare", "/data"]
+
+# Relative weights of what a synthetic user does after landing on a page.
+ACTIONS = {"navigate": 3, "select": 4, "filter": 2, "reset": 1, "table": 1}
+
+# Recorded requests from one client further apart than this start a new session.
+SESSION_GAP = 30 * 60
+
+
+class SessionAborted(Exception):
+    pass
+
+
+class Stopped(Exception):
+    pass
+
+
+class TestClientTarget:
+    # In-process through the Flask test client. Each user thread gets its own
+    # client, so concurrency measures contention inside one process rather
+    # than how gunicorn workers scale.
+
+    def __init__(self):
+        from app import app
+
+        self.server = app.server
+        self._local = threading.local()
+
+    def fetch(self, path, body=None):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.server.test_client()
+        response = client.get(path) if body is None else client.post(path, json=body)
+        return response.status_code, response.data
+
+
+class HttpTarget:
+    def __init__(self, url, timeout=60):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def fetch(self, path, body=None):
+        data = None if body is None else json.dumps(body).encode("utf-8")
+        request = urllib.request.Request(self.url + path, data=data, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.read()
+
+
+def label(output):
+    # The first output component names the callback; handler names are not
+    # part of the Dash protocol, so replayed traces cannot carry them.
+    return output.strip(".").split("...")[0].rsplit(".", 1)[0]
+
+
+def components(node, found):
+    if isinstance(node, list):
+        for child in node:
+            components(child, found)
+    elif isinstance(node, dict) and "props" in node and "type" in node:
+        props = node["props"]
+        if isinstance(props.get("id"), str):
+            found[props["id"]] = props
+        for value in props.values():
+            components(value, found)
+    return found
+
+
+class Callback:
+    def __init__(self, spec):
+        self.output = spec["output"]
+        self.multi = self.output.startswith("..")
+        self.outputs = [tuple(item.rsplit(".", 1)) for item in self.output.strip(".").split("...")]
+        self.inputs = [(dep["id"], dep["property"]) for dep in spec["inputs"]]
+        self.state = [(dep["id"], dep["property"]) for dep in spec["state"]]
+        self.initial = not spec.get("prevent_initial_call")
+        self.ids = {key[0] for key in self.outputs + self.inputs + self.state}
+
+    def body(self, value, triggers):
+        outputs = [{"id": id_, "property": prop} for id_, prop in self.outputs]
+        return {
+            "output": self.output,
+            "outputs": outputs if self.multi else outputs[0],
+            "inputs": [{"id": id_, "property": prop, "value": value(id_, prop)} for id_, prop in self.inputs],
+            "state": [{"id": id_, "property": prop, "value": value(id_, prop)} for id_, prop in self.state],
+            "changedPropIds": [f"{id_}.{prop}" for id_, prop in self.inputs if (id_, prop) in triggers],
+        }
+
+
+class Browser:
+    # A minimal stand-in for the Dash renderer. It holds the props of every
+    # mounted component and fires the callbacks whose inputs change, plus the
+    # initial calls of callbacks reading or writing newly mounted components. A callback waits while
+    # another pending callback produces one of its inputs, and the responses
+    # are applied as they arrive.
+
+    def __init__(self, callbacks, layout, send):
+        self.callbacks = callbacks
+        self.send = send
+        self.props = components(layout, {})
+        self.owned = {}
+
+    def value(self, id_, prop):
+        return self.props.get(id_, {}).get(prop)
+
+    def choices(self, id_):
+        options = self.props[id_].get("options") or []
+        return [option["value"] if isinstance(option, dict) else option for option in options]
+
+    def mount(self, key, value):
+        removed = self.owned.pop(key, set())
+        for id_ in removed:
+            self.props.pop(id_, None)
+        for nested in [nested for nested in self.owned if nested[0] in removed]:
+            del self.owned[nested]
+        found = components(value, {})
+        self.props.update(found)
+        self.owned[key] = set(found)
+        return set(found)
+
+    def apply(self, response, source):
+        changed, mounted = {}, set()
+        for id_, props in response.get("response", {}).items():
+            if id_ not in self.props:
+                continue
+            for prop, value in props.items():
+                self.props[id_][prop] = value
+                changed[(id_, prop)] = source
+                if prop == "children":
+                    mounted |= self.mount((id_, prop), value)
+        return changed, mounted
+
+    def update(self, changed=(), mounted=()):
+        # changed maps each changed prop to the callback that wrote it (None for
+        # the user); like Dash, a callback never re-triggers itself.
+        changed, mounted = dict.fromkeys(changed), set(mounted)
+        pending = {}
+        while True:
+            for callback in self.callbacks:
+                if not callback.ids <= self.props.keys():
+                    continue
+                triggers = {key for key in callback.inputs if key in changed and changed[key] is not callback}
+                if triggers or (callback.initial and any(id_ in mounted for id_, _ in callback.inputs + callback.outputs)):
+                    pending.setdefault(callback, set()).update(triggers)
+            if not pending:
+                return
+            produced = {key for callback in pending for key in callback.outputs}
+            ready = [
+                callback for callback in pending
+                if not any(key in produced and key not in callback.outputs for key in callback.inputs)
+            ] or list(pending)
+            changed, mounted = {}, set()
+            for callback in ready:
+                triggers = pending.pop(callback)
+                if not callback.ids <= self.props.keys():
+                    continue
+                response = self.send(callback.body(self.value, triggers))
+                if response:
+                    new_changed, new_mounted = self.apply(response, callback)
+                    changed.update(new_changed)
+                    mounted |= new_mounted
+
+    def set(self, changes):
+        for (id_, prop), value in changes.items():
+            self.props[id_][prop] = value
+        self.update(changed=changes)
+
+    def load(self, pathname):
+        self.props["url"]["pathname"] = pathname
+        self.update(mounted=set(self.props))
+
+
+def navigate(browser, rng):
+    current = browser.value("url", "pathname")
+    browser.set({("url", "pathname"): rng.choice([page for page in PAGES if page != current])})
+
+
+def select(browser, rng):
+    candidates = [
+        id_ for id_, props in browser.props.items()
+        if props.get("options") and not id_.startswith("filter-")
+    ]
+    if not candidates:
+        return navigate(browser, rng)
+    id_ = rng.choice(candidates)
+    choices = browser.choices(id_)
+    if browser.props[id_].get("multi") or isinstance(browser.value(id_, "value"), list):
+        value = rng.sample(choices, min(len(choices), rng.randint(2, 4)))
+    else:
+        value = rng.choice(choices)
+    browser.set({(id_, "value"): value})
+
+
+def change_filter(browser, rng):
+    candidates = [id_ for id_, props in browser.props.items() if id_.startswith("filter-") and props.get("options")]
+    if not candidates:
+        return select(browser, rng)
+    browser.set({("filter-button", "n_clicks"): (browser.value("filter-button", "n_clicks") or 0) + 1})
+    id_ = rng.choice(candidates)
+    choices = browser.choices(id_)
+    browser.set({(id_, "value"): rng.sample(choices, min(len(choices), rng.randint(1, 2)))})
+
+
+def reset(browser, rng):
+    browser.set({("reset-filters", "n_clicks"): (browser.value("reset-filters", "n_clicks") or 0) + 1})
+
+
+def page_table(browser, rng):
+    if "data-table" not in browser.props:
+        return select(browser, rng)
+    if rng.random() < 0.5:
+        page_count = browser.value("data-table", "page_count") or 1
+        browser.set({("data-table", "page_current"): rng.randrange(page_count)})
+    else:
+        column = rng.choice(browser.props["data-table"]["columns"])["id"]
+        browser.set({("data-table", "sort_by"): [{"column_id": column, "direction": rng.choice(["asc", "desc"])}]})
+
+
+ACTION_HANDLERS = {"navigate": navigate, "select": select, "filter": change_filter, "reset": reset, "table": page_table}
+
+
+class App:
+    # Layout and callback graph fetched once from the target.
+
+    def __init__(self, target):
+        self.target = target
+        status, self.layout = target.fetch("/_dash-layout")
+        if status != 200:
+            raise SystemExit(f"/_dash-layout returned {status}")
+        status, dependencies = target.fetch("/_dash-dependencies")
+        if status != 200:
+            raise SystemExit(f"/_dash-dependencies returned {status}")
+        self.callbacks = [Callback(spec) for spec in json.loads(dependencies) if not spec.get("clientside_function")]
+
+    def browser(self, send):
+        # Parsed afresh per session, since the browser mutates its props.
+        return Browser(self.callbacks, json.loads(self.layout), send)
+
+
+class User:
+    def __init__(self, target, deadline, recorder=None):
+        self.target = target
+        self.deadline = deadline
+        self.recorder = recorder
+        self.session = None
+        self.samples = []
+        self.sessions = 0
+        self.aborted = 0
+
+    def send(self, body):
+        if time.perf_counter() >= self.deadline:
+            raise Stopped()
+        if self.recorder:
+            self.recorder.write(self.session, body)
+        start = time.perf_counter()
+        try:
+            status, data = self.target.fetch(DISPATCH_PATH, body)
+        except OSError as exc:
+            status, data = None, str(exc)
+        elapsed = time.perf_counter() - start
+        ok = status in (200, 204)
+        self.samples.append((label(body["output"]), elapsed, ok))
+        if not ok:
+            raise SessionAborted(f"{label(body['output'])} returned {status}")
+        return json.loads(data) if status == 200 else None
+
+
+class Recorder:
+    # Writes synthetic sessions in the F1_TRACE_PATH format, so a run can be
+    # replayed request for request later.
+
+    def __init__(self, path):
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, session, body):
+        line = json.dumps({"ts": time.time(), "session": session, "body": body}) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def close(self):
+        self._file.close()
+
+
+def pause(rng, think):
+    if think > 0:
+        time.sleep(rng.expovariate(1 / think))
+
+
+def synthetic_sessions(app, seed, actions, think):
+    names = list(ACTIONS)
+    weights = list(ACTIONS.values())
+    
+    def run(number, user):
+        rng = random.Random(f"{seed}-{number}")
+        user.session = f"synthetic-{seed}-{number}"
+        browser = app.browser(user.send)
+        browser.load(rng.choice(PAGES))
+        for _ in range(max(1, round(rng.expovariate(1 / actions)))):
+            pause(rng, think)
+            ACTION_HANDLERS[rng.choices(names, weights)[0]](browser, rng)
+    
+    return run
+
+
+def load_traces(paths):
+    by_client = defaultdict(list)
+    for path in paths:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    entry = json.loads(line)
+                    by_client[entry["session"]].append((entry["ts"], entry["body"]))
+    sessions = []
+    for entries in by_client.values():
+        entries.sort(key=lambda entry: entry[0])
+        current = [entries[0]]
+        for entry in entries[1:]:
+            if entry[0] - current[-1][0] > SESSION_GAP:
+                sessions.append(current)
+                current = []
+            current.append(entry)
+        sessions.append(current)
+    return sessions
+
+
+def replayed_sessions(sessions, speed):
+    # Requests are sent one after another; with a speed above zero the
+    # recorded gaps are kept, divided by it.
+    def run(number, user):
+        session = sessions[number % len(sessions)]
+        previous = session[0][0]
+        for ts, body in session:
+            if speed > 0:
+                time.sleep(min((ts - previous) / speed, max(user.deadline - time.perf_counter(), 0)))
+            previous = ts
+            user.send(body)
+    
+    return run
+
+
+def warm_up(app):
+    # One untimed visit to every page, so lazy indexes, imports and the first
+    # figure renders are not charged to the first concurrency level.
+    user = User(app.target, math.inf)
+    for page in PAGES:
+        app.browser(user.send).load(page)
+
+
+def summarize(samples, elapsed):
+    if not samples:
+        return {"requests": 0, "errors": 0, "error_rate": 0.0, "throughput_rps": 0.0}
+    timings = np.array([seconds for _, seconds, _ in samples]) * 1000
+    errors = sum(1 for _, _, ok in samples if not ok)
+    p50, p90, p95, p99 = np.percentile(timings, [50, 90, 95, 99])
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4),
+        "throughput_rps": round(len(samples) / elapsed, 2),
+        "p50_ms": round(float(p50), 3),
+        "p90_ms": round(float(p90), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(timings.max()), 3),
+    }
+
+
+def run_level(target, run_session, users, duration, max_sessions, recorder=None):
+    deadline = time.perf_counter() + duration
+    numbers = iter(range(max_sessions)) if max_sessions else itertools.count()
+    lock = threading.Lock()
+    workers = [User(target, deadline, recorder) for _ in range(users)]
+    
+    def loop(user):
+        while time.perf_counter() < deadline:
+            with lock:
+                number = next(numbers, None)
+            if number is None:
+                return
+            try:
+                run_session(number, user)
+                user.sessions += 1
+            except SessionAborted:
+                user.aborted += 1
+            except Stopped:
+                return
+    
+    start = time.perf_counter()
+    threads = [threading.Thread(target=loop, args=(user,), daemon=True) for user in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    samples = [sample for user in workers for sample in user.samples]
+    by_callback = defaultdict(list)
+    for sample in samples:
+        by_callback[sample[0]].append(sample)
+    result = {
+        "users": users,
+        "seconds": round(elapsed, 3),
+        "sessions": sum(user.sessions for user in workers),
+        "aborted_sessions": sum(user.aborted for user in workers),
+        **summarize(samples, elapsed),
+    }
+    result["callbacks"] = {name: summarize(items, elapsed) for name, items in sorted(by_callback.items())}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay Dash callback sessions against the app at increasing concurrency.")
+    where = parser.add_mutually_exclusive_group()
+    where.add_argument("--url", help="Running server to load; default drives app.server in-process.")
+    where.add_argument("--gunicorn", type=int, metavar="WORKERS", help="Start a local gunicorn with this many workers.")
+    parser.add_argument("--replay", nargs="+", metavar="TRACE", help="Replay recorded F1_TRACE_PATH sessions instead of synthetic ones.")
+    parser.add_argument("--record", metavar="TRACE", help="Append the synthetic sessions sent to this trace file.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--duration", type=float, default=30, help="Seconds per concurrency level.")
+    parser.add_argument("--sessions", type=int, default=0, help="Stop a level after this many sessions (0 for no limit).")
+    parser.add_argument("--actions", type=float, default=8, help="Mean actions per synthetic session after landing.")
+    parser.add_argument("--think", type=float, default=0, help="Mean seconds between a synthetic user's actions.")
+    parser.add_argument("--speed", type=float, default=0, help="Replay speed-up of recorded gaps; 0 sends back to back.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench-results-load.json")
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    process = None
+    if args.gunicorn:
+        process, port = serve(args.gunicorn, preload=True)
+        target = HttpTarget(f"http://127.0.0.1:{port}")
+        mode = f"gunicorn x{args.gunicorn}"
+    elif args.url:
+        target = HttpTarget(args.url)
+        mode = args.url
+    else:
+        target = TestClientTarget()
+        mode = "test client"
+    
+    recorder = Recorder(args.record) if args.record and not args.replay else None
+    try:
+        app = App(target)
+        if args.replay:
+            sessions = load_traces(args.replay)
+            run_session = replayed_sessions(sessions, args.speed)
+            source = f"{len(sessions)} recorded sessions"
+        else:
+            run_session = synthetic_sessions(app, args.seed, args.actions, args.think)
+            source = "synthetic sessions"
+        warm_up(app)
+        
+        levels = []
+        for users in args.concurrency:
+            levels.append(run_level(target, run_session, users, args.duration, args.sessions, recorder))
+            print(f"{users} users: {levels[-1]['requests']} requests", file=sys.stderr)
+    finally:
+        if recorder:
+            recorder.close()
+        if process:
+            process.send_signal(signal.SIGTERM)
+            process.wait(timeout=30)
+    
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": mode,
+            "source": source,
+            "duration": args.duration,
+            "seed": args.seed,
+        },
+        "levels": levels,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    
+    print(f"{mode}, {source}")
+    print(f"{'users':>5} {'sessions':>8} {'requests':>8} {'errors':>7} {'req/s':>8} "
+          f"{'p50 ms':>8} {'p90 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for level in levels:
+        if not level["requests"]:
+            print(f"{level['users']:>5} {level['sessions']:>8} {0:>8}")
+            continue
+        print(f"{level['users']:>5} {level['sessions']:>8} {level['requests']:>8} {level['error_rate']:>7.2%} "
+              f"{level['throughput_rps']:>8.1f} {level['p50_ms']:>8.1f} {level['p90_ms']:>8.1f} "
+              f"{level['p95_ms']:>8.1f} {level['p99_ms']:>8.1f} {level['max_ms']:>8.1f}")
+    
+    busiest = levels[-1]
+    print(f"\nper callback at {busiest['users']} users")
+    print(f"{'callback':<24} {'requests':>8} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, stats in busiest["callbacks"].items():
+        print(f"{name:<24} {stats['requests']:>8} {stats['errors']:>7} {stats['p50_ms']:>8.1f} "
+              f"{stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}")
+    print(f"wrote {len(levels)} levels to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import multiprocessing
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.bench_workers import memory_kb
+from benchmarks.common import scale_frame
+from data.loader import (
+    Dataset, build_memberships, load_data, read_mapped, read_snapshot, write_mapped, write_snapshot,
+)
+
+
+KEY = "bench"
+
+
+def attach(storage, path, barrier, results):
+    # Each process loads the dataset the way a worker would, touches every
+    # column and membership, then waits until all processes are resident so
+    # PSS splits shared pages between them.
+    if storage == "mmap":
+        df, memberships = read_mapped(path, KEY)
+    else:
+        (df, _), memberships = read_snapshot(path, KEY), None
+    dataset = Dataset(df, KEY, memberships)
+    for col in df.columns:
+        pd.util.hash_pandas_object(df[col], index=False).sum()
+    for membership in dataset.memberships.values():
+        membership.counts()
+    barrier.wait()
+    results.put(memory_kb(multiprocessing.current_process().pid))
+    barrier.wait()
+
+
+def measure(storage, path, processes):
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(processes)
+    results = context.Queue()
+    workers = [context.Process(target=attach, args=(storage, path, barrier, results)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    memory = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    return memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-process memory of the in-memory and memory-mapped datasets.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+    
+    df = scale_frame(load_data(), args.rows)
+    print(f"{'storage':<8} {'processes':>9} {'RSS MB':>8} {'PSS MB':>8} {'total PSS MB':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {"memory": Path(tmp) / "penalties-bench.parquet", "mmap": Path(tmp) / "penalties-bench.arrow"}
+        write_snapshot(df, paths["memory"], KEY)
+        write_mapped(df, build_memberships(df), paths["mmap"], KEY)
+        for storage, path in paths.items():
+            memory = measure(storage, path, args.processes)
+            rss = sum(rss for rss, _ in memory) / len(memory)
+            pss = sum(pss for _, pss in memory) / len(memory)
+            print(f"{storage:<8} {args.processes:>9} {rss / 1024:8.1f} {pss / 1024:8.1f} "
+                  f"{sum(pss for _, pss in memory) / 1024:13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import gc
+import tracemalloc
+
+import pyarrow as pa
+
+from benchmarks.bench_filter import legacy_filter_data
+from benchmarks.common import scale_frame, with_list_columns
+from components.charts import driver_cumulative_points, driver_timeline
+from data.loader import filter_data, load_data, use_dataset
+
+
+FILTER_SETS = {
+    "none": {},
+    "single year": {"years": [2023]},
+    "steward + outcome": {"stewards": ["Garry Connelly"], "outcomes": ["Penalty Points"]},
+}
+DRIVER = "Max Verstappen"
+
+
+def legacy_driver_frames(df, driver_name):
+    timeline = df[df["Driver"] == driver_name].copy()
+    timeline = timeline.sort_values(["Year", "Round"])
+    timeline["Race_Label"] = timeline["Year"].astype(str) + " R" + timeline["Round"].astype(str)
+    
+    cumulative = df[df["Driver"] == driver_name].copy()
+    cumulative = cumulative.sort_values(["Year", "Round"])
+    cumulative["Penalty Points"] = cumulative["Penalty Points"].fillna(0)
+    cumulative["Cumulative_PP"] = cumulative["Penalty Points"].cumsum()
+    return timeline, cumulative
+
+
+def legacy_request(df, filters):
+    filtered = legacy_filter_data(df, filters)
+    legacy_driver_frames(filtered, DRIVER)
+    return filtered
+
+
+def current_request(df, filters):
+    driver_timeline.cache.clear()
+    filtered = filter_data(df, filters)
+    driver_timeline(filtered, DRIVER)
+    driver_cumulative_points(filtered, DRIVER)
+    return filtered
+
+
+def peak_bytes(func):
+    gc.collect()
+    pool = pa.default_memory_pool()
+    arrow_before = pool.bytes_allocated()
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    arrow_delta = pool.bytes_allocated() - arrow_before
+    del result
+    return peak, arrow_delta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak allocations per request, before and after copy-free filtering.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+    
+    base = load_data()
+    print(f"{'rows':>10} {'filter set':<18} {'legacy peak MB':>15} {'current peak MB':>16} {'arrow MB (legacy/current)':>26}")
+    for size in args.sizes:
+        df = use_dataset(scale_frame(base, size), f"bench-{size}").df
+        legacy_df = with_list_columns(df)
+        for name, filters in FILTER_SETS.items():
+            current_request(df, filters)
+            legacy_peak, legacy_arrow = peak_bytes(lambda: legacy_request(legacy_df, filters))
+            peak, arrow = peak_bytes(lambda: current_request(df, filters))
+            print(f"{size:>10,} {name:<18} {legacy_peak / 1e6:15.1f} {peak / 1e6:16.1f} "
+                  f"{legacy_arrow / 1e6:12.1f} / {arrow / 1e6:.1f}")
+
+
+if __name__ == "__main__":
+    main()
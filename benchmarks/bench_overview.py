@@ -0,0 +1,79 @@
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.bench_filter import FILTER_SETS
+from benchmarks.common import best_of, scale_frame
+from data.loader import filter_data, get_cube, get_membership, load_data, use_dataset
+
+
+def legacy_overview(df):
+    return {
+        "total": len(df),
+        "drivers": df["Driver"].nunique(),
+        "fines": df["Fine"].sum(),
+        "pp": df["Penalty Points"].sum(),
+        "year": df.groupby("Year", observed=True).size(),
+        "drivers_top": df["Driver"].value_counts().loc[lambda c: c > 0],
+        "teams_top": df["Team"].value_counts().loc[lambda c: c > 0],
+        "allegations": df["Allegation"].value_counts().loc[lambda c: c > 0],
+        "outcomes": get_membership(df, "outcomes").counts().loc[lambda c: c > 0],
+        "pp_by_driver": df.groupby("Driver", observed=True)["Penalty Points"].sum(),
+    }
+
+
+def cube_overview(df):
+    get_cube.cache.clear()
+    cube = get_cube(df)
+    return {
+        "total": cube.total,
+        "drivers": cube.cells["Driver"].nunique(),
+        "fines": cube.sum("Fine"),
+        "pp": cube.sum("Penalty Points"),
+        "year": cube.totals_by("Year"),
+        "drivers_top": cube.totals_by("Driver"),
+        "teams_top": cube.totals_by("Team"),
+        "allegations": cube.totals_by("Allegation"),
+        "outcomes": cube.outcome_counts().loc[lambda c: c > 0],
+        "pp_by_driver": cube.totals_by("Driver", "Penalty Points"),
+    }
+
+
+def check(expected, actual, name):
+    for key, value in expected.items():
+        other = actual[key]
+        if isinstance(value, pd.Series):
+            value = value.sort_index()
+            other = other.sort_index()
+            assert list(value.index) == list(other.index), (name, key)
+            assert (abs(value.to_numpy(dtype=float) - other.to_numpy(dtype=float)) < 1e-6).all(), (name, key)
+        else:
+            assert abs(float(value) - float(other)) < 1e-6, (name, key)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark overview aggregates: row scans vs the penalty cube.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 100, 1000])
+    args = parser.parse_args()
+    
+    base = load_data()
+    print(f"{'rows':>10} {'filter set':<18} {'rows ms':>10} {'cube ms':>10} {'speedup':>8}")
+    for scale in args.scales:
+        scaled = scale_frame(base, len(base) * scale)
+        start = time.perf_counter()
+        dataset = use_dataset(scaled, f"bench-{scale}")
+        build_seconds = time.perf_counter() - start
+        
+        for name, filters in FILTER_SETS.items():
+            filtered = filter_data(dataset.df, filters)
+            legacy_seconds, expected = best_of(lambda: legacy_overview(filtered))
+            seconds, actual = best_of(lambda: cube_overview(filtered))
+            check(expected, actual, name)
+            print(f"{len(scaled):>10,} {name:<18} {legacy_seconds * 1000:10.1f} {seconds * 1000:10.1f} "
+                  f"{legacy_seconds / seconds:7.1f}x")
+        print(f"{len(scaled):>10,} dataset build {build_seconds:.2f}s, cube {len(dataset.cube.cells):,} cells")
+
+
+if __name__ == "__main__":
+    main()
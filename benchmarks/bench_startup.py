@@ -0,0 +1,53 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Boot the app in a fresh interpreter and time until the first page and its
+# layout have been served, so import costs are counted every run.
+PROBE = """
+import json, time
+start = time.perf_counter()
+import app
+client = app.server.test_client()
+client.get("/")
+first_byte = time.perf_counter() - start
+client.get("/_dash-layout")
+layout = time.perf_counter() - start
+client.get("/_dash-dependencies")
+print(json.dumps({"first_byte": first_byte, "layout": layout}))
+"""
+
+
+def boot(mode):
+    env = dict(os.environ, F1_STARTUP_MODE=mode)
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Boot-to-first-byte for each startup mode.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", default=["lazy", "eager"])
+    args = parser.parse_args()
+    
+    print(f"{'mode':<8} {'first byte s':>13} {'layout s':>10} {'min first byte s':>17}")
+    for mode in args.modes:
+        boot(mode)
+        runs = [boot(mode) for _ in range(args.runs)]
+        first_byte = [run["first_byte"] for run in runs]
+        layout = [run["layout"] for run in runs]
+        print(f"{mode:<8} {statistics.median(first_byte):13.3f} {statistics.median(layout):10.3f} {min(first_byte):17.3f}")
+
+
+if __name__ == "__main__":
+    main()
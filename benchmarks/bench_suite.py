@@ -0,0 +1,300 @@
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data.cache import CACHES
+from data.loader import filter_data, load_dataset, use_dataset
+from data.synthetic import PenaltyModel, generate_dataset
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+FILTER_SETS = {
+    "none": {},
+    "single year": {"years": [2023]},
+    "single driver": {"drivers": ["Max Verstappen"]},
+    "steward + outcome": {"stewards": ["Garry Connelly"], "outcomes": ["Penalty Points"]},
+}
+
+DRIVER = "Max Verstappen"
+DRIVERS = ["Max Verstappen", "Lewis Hamilton", "Lando Norris"]
+TEAM = "Ferrari"
+RACE = "Monaco"
+YEAR = 2023
+STEWARD = "Garry Connelly"
+
+CHART_ARGS = {
+    "penalties_by_year": (),
+    "top_drivers": (),
+    "top_teams": (),
+    "allegation_breakdown": (),
+    "outcome_breakdown": (),
+    "penalty_points_by_driver": (),
+    "driver_timeline": (DRIVER,),
+    "driver_allegation_breakdown": (DRIVER,),
+    "driver_cumulative_points": (DRIVER,),
+    "team_drivers_breakdown": (TEAM,),
+    "team_yearly_trend": (TEAM,),
+    "race_summary": (YEAR, RACE),
+    "steward_penalties_issued": (),
+    "steward_avg_penalty_points": (),
+    "comparison_bar": ("Driver", DRIVERS, "count"),
+    "comparison_allegation": ("Driver", DRIVERS),
+    "comparison_yearly_trend": ("Driver", DRIVERS),
+    "driver_incidents_with": (DRIVER,),
+    "driver_involved_in_others": (DRIVER,),
+    "race_penalties_by_year": (RACE,),
+    "race_drivers_by_year": (RACE,),
+    "race_allegations_by_year": (RACE,),
+    "steward_team_driver_breakdown": (STEWARD,),
+    "steward_statistical_comparison": (STEWARD,),
+    "steward_team_bias_analysis": (STEWARD,),
+}
+
+# Values for callback inputs other than the filter store.
+INPUT_VALUES = {
+    ("driver-select", "value"): DRIVER,
+    ("team-select", "value"): TEAM,
+    ("race-select", "value"): RACE,
+    ("race-year-select", "value"): YEAR,
+    ("steward-select", "value"): STEWARD,
+    ("compare-type", "value"): "drivers",
+    ("compare-select", "value"): DRIVERS,
+    ("compare-metric", "value"): "count",
+    ("filter-year", "value"): [YEAR],
+    ("navbar-toggler", "n_clicks"): 1,
+    ("filter-button", "n_clicks"): 1,
+    ("reset-filters", "n_clicks"): None,
+    ("data-table", "page_current"): 0,
+    ("data-table", "page_size"): 25,
+    ("data-table", "sort_by"): [{"column_id": "Penalty Points", "direction": "desc"}],
+    ("data-table", "filter_query"): "",
+}
+
+
+def clear_caches():
+    for cache in CACHES:
+        cache.clear()
+
+
+def summarize(timings):
+    timings = np.asarray(timings) * 1000
+    return {
+        "median_ms": round(float(np.median(timings)), 3),
+        "p95_ms": round(float(np.percentile(timings, 95)), 3),
+        "min_ms": round(float(timings.min()), 3),
+    }
+
+
+def peak_allocation(func):
+    clear_caches()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(func, repeat, prepare=None):
+    # Cold timings clear every cache first, so each run pays what the first
+    # request for that state would; the warm timing is the cache-hit path. An
+    # untimed first call keeps one-off imports out of the numbers.
+    func(*(prepare() if prepare else ()))
+    timings = []
+    for _ in range(repeat):
+        clear_caches()
+        args = prepare() if prepare else ()
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    func(*args)
+    warm = time.perf_counter() - start
+    result = summarize(timings)
+    result["warm_ms"] = round(warm * 1000, 3)
+    result["peak_alloc_bytes"] = peak_allocation(lambda: func(*(prepare() if prepare else ())))
+    return result
+
+
+def chart_functions():
+    import components.charts as charts
+    
+    found = {
+        name: func for name, func in vars(charts).items()
+        if callable(func) and hasattr(func, "cache") and getattr(func, "__module__", None) == charts.__name__
+    }
+    missing = sorted(set(found) - set(CHART_ARGS))
+    if missing:
+        raise SystemExit(f"No benchmark arguments for chart builders: {', '.join(missing)}")
+    return found
+
+
+def bench_charts(dataset_name, filters_by_name, repeat, only):
+    results = []
+    for name, func in chart_functions().items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        for filter_name, filters in filters_by_name.items():
+            df = load_dataset().df
+            result = measure(
+                lambda frame: func(frame, *CHART_ARGS[name]),
+                repeat,
+                prepare=lambda: (filter_data(df, filters),),
+            )
+            results.append({"kind": "chart", "name": name, "dataset": dataset_name, "filters": filter_name, **result})
+    return results
+
+
+def callback_specs(client, app):
+    specs = []
+    for spec in client.get("/_dash-dependencies").get_json():
+        handler = app.callback_map[spec["output"]]["callback"]
+        if handler.__module__ == "callbacks.callbacks":
+            specs.append((handler.__name__, spec))
+    return specs
+
+
+def callback_body(spec, filters):
+    inputs = []
+    for dep in spec["inputs"]:
+        key = (dep["id"], dep["property"])
+        value = filters if key == ("filter-store", "data") else INPUT_VALUES.get(key)
+        inputs.append({"id": dep["id"], "property": dep["property"], "value": value})
+    outputs = [
+        {"id": item.rsplit(".", 1)[0], "property": item.rsplit(".", 1)[1]}
+        for item in spec["output"].strip(".").split("...")
+    ]
+    return {
+        "output": spec["output"],
+        "outputs": outputs if spec["output"].startswith("..") else outputs[0],
+        "inputs": inputs,
+        "state": [{"id": dep["id"], "property": dep["property"], "value": None} for dep in spec["state"]],
+        "changedPropIds": [f"{item['id']}.{item['property']}" for item in inputs],
+    }
+
+
+def bench_callbacks(dataset_name, filters_by_name, repeat, only):
+    from app import app
+    from monitoring.metrics import callback_seconds
+    
+    client = app.server.test_client()
+    results = []
+    for name, spec in callback_specs(client, app):
+        if only and not any(pattern in name for pattern in only):
+            continue
+        uses_filters = any(dep["id"] == "filter-store" for dep in spec["inputs"])
+        runs = filters_by_name if uses_filters else {"n/a": {}}
+        for filter_name, filters in runs.items():
+            body = callback_body(spec, filters)
+            sizes = []
+            
+            def dispatch():
+                response = client.post("/_dash-update-component", json=body)
+                if response.status_code not in (200, 204):
+                    raise RuntimeError(f"{name} returned {response.status_code}")
+                sizes.append(len(response.data))
+            
+            body_before = callback_seconds.totals(callback=name)
+            result = measure(dispatch, repeat)
+            body_after = callback_seconds.totals(callback=name)
+            calls = body_after[1] - body_before[1]
+            result["body_mean_ms"] = round((body_after[0] - body_before[0]) / calls * 1000, 3) if calls else None
+            result["response_bytes"] = max(sizes)
+            results.append({"kind": "callback", "name": name, "dataset": dataset_name, "filters": filter_name, **result})
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    baseline = json.loads(Path(baseline_path).read_text())
+    previous = {(r["kind"], r["name"], r["dataset"], r["filters"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get((result["kind"], result["name"], result["dataset"], result["filters"]))
+        if before and before["median_ms"] > 0:
+            ratio = result["median_ms"] / before["median_ms"]
+            if ratio > threshold:
+                regressions.append((ratio, result, before))
+    for ratio, result, before in sorted(regressions, key=lambda item: -item[0]):
+        print(f"REGRESSION {ratio:5.2f}x {result['kind']:<8} {result['name']:<32} {result['dataset']:<18} "
+              f"{result['filters']:<18} {before['median_ms']:9.2f} -> {result['median_ms']:9.2f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every chart builder and callback under representative filters.")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[100_000],
+                        help="Synthetic dataset sizes to run after the workbook (none to skip).")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", help="Only run charts/callbacks whose name contains one of these.")
+    parser.add_argument("--skip-charts", action="store_true")
+    parser.add_argument("--skip-callbacks", action="store_true")
+    parser.add_argument("--output", default="bench-results.json")
+    parser.add_argument("--baseline", help="Earlier results file to compare median timings against.")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Median ratio reported as a regression.")
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    base = load_dataset().df
+    model = PenaltyModel(base)
+    datasets = [("workbook", None)] + [(f"synthetic-{size}", size) for size in args.sizes]
+    
+    results = []
+    rows = {}
+    for dataset_name, size in datasets:
+        df = base if size is None else generate_dataset(size, model=model)
+        rows[dataset_name] = len(use_dataset(df, dataset_name).df)
+        if not args.skip_charts:
+            results.extend(bench_charts(dataset_name, FILTER_SETS, args.repeat, args.only))
+        if not args.skip_callbacks:
+            results.extend(bench_callbacks(dataset_name, FILTER_SETS, args.repeat, args.only))
+        print(f"{dataset_name}: {len(results)} measurements so far", file=sys.stderr)
+    
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "rows": rows,
+            "filter_sets": FILTER_SETS,
+        },
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    
+    print(f"{'kind':<8} {'name':<32} {'dataset':<18} {'filters':<18} {'median ms':>10} {'p95 ms':>9} {'warm ms':>8} {'peak MB':>8}")
+    for result in results:
+        print(f"{result['kind']:<8} {result['name']:<32} {result['dataset']:<18} {result['filters']:<18} "
+              f"{result['median_ms']:10.2f} {result['p95_ms']:9.2f} {result['warm_ms']:8.2f} "
+              f"{result['peak_alloc_bytes'] / 1e6:8.2f}")
+    print(f"wrote {len(results)} measurements to {args.output}")
+    
+    if args.baseline and compare(results, args.baseline, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import argparse
+import json
+
+from benchmarks.common import best_of, scale_frame
+from data.loader import filter_data, load_data, use_dataset
+from data.table import TABLE_COLUMNS, table_page, view_cache
+
+
+SORT_BY = [{"column_id": "Penalty Points", "direction": "desc"}, {"column_id": "Driver", "direction": "asc"}]
+FILTER_QUERY = "{Driver} contains Max && {Year} >= 2022"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Raw data table: full serialization vs server-side pages.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+    
+    base = load_data()
+    print(f"{'rows':>10} {'full payload MB':>16} {'page payload KB':>16} {'query+sort ms':>14} {'page flip ms':>13}")
+    for size in args.sizes:
+        df = use_dataset(scale_frame(base, size), f"bench-{size}").df
+        filtered = filter_data(df, {})
+        full_bytes = len(json.dumps(filtered[TABLE_COLUMNS].to_dict("records"), default=str))
+        
+        def cold():
+            view_cache.clear()
+            return table_page({}, FILTER_QUERY, SORT_BY, 0)
+        
+        cold_seconds, _ = best_of(cold)
+        flip_seconds, (records, _) = best_of(lambda: table_page({}, FILTER_QUERY, SORT_BY, 3))
+        page_bytes = len(json.dumps(records, default=str))
+        print(f"{size:>10,} {full_bytes / 1e6:16.1f} {page_bytes / 1e3:16.1f} "
+              f"{cold_seconds * 1000:14.1f} {flip_seconds * 1000:13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+WARM_PATHS = ["/", "/_dash-layout", "/_dash-dependencies", "/export/csv?years=2023"]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def children(pid):
+    path = Path(f"/proc/{pid}/task/{pid}/children")
+    return [int(child) for child in path.read_text().split()]
+
+
+def memory_kb(pid):
+    fields = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, value = line.split(":", 1)
+        fields[name] = int(value.split()[0])
+    return fields["Rss"], fields["Pss"]
+
+
+def serve(workers, preload, timeout=60):
+    port = free_port()
+    env = dict(os.environ, F1_PRELOAD="1" if preload else "0")
+    env.pop("F1_STARTUP_MODE", None)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app:server", "--config", "gunicorn.conf.py",
+         "--bind", f"127.0.0.1:{port}", "--workers", str(workers)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=5).read()
+            if len(children(process.pid)) == workers:
+                break
+        except OSError:
+            pass
+        time.sleep(0.2)
+    else:
+        process.kill()
+        raise RuntimeError(f"gunicorn did not start {workers} workers within {timeout}s")
+    
+    # Without preload each worker loads the dataset on its first request, so
+    # send enough traffic that every worker has served the warm-up paths.
+    for _ in range(workers * 4):
+        for path in WARM_PATHS:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=30).read()
+    return process, port
+
+
+def measure(workers, preload):
+    process, _ = serve(workers, preload)
+    try:
+        master = memory_kb(process.pid)
+        pids = children(process.pid)
+        worker_memory = [memory_kb(pid) for pid in pids]
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+    return master, worker_memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RSS and PSS per gunicorn worker, with and without preload.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    
+    print(f"{'preload':<8} {'workers':>7} {'master RSS MB':>14} {'worker RSS MB':>14} "
+          f"{'worker PSS MB':>14} {'total PSS MB':>13} {'PSS per extra worker MB':>24}")
+    for preload in (False, True):
+        baseline = None
+        for workers in sorted(args.workers):
+            (master_rss, master_pss), worker_memory = measure(workers, preload)
+            worker_rss = sum(rss for rss, _ in worker_memory) / len(worker_memory)
+            worker_pss = sum(pss for _, pss in worker_memory) / len(worker_memory)
+            total_pss = master_pss + sum(pss for _, pss in worker_memory)
+            if baseline is None:
+                baseline = (workers, total_pss)
+                extra = "-"
+            else:
+                extra = f"{(total_pss - baseline[1]) / (workers - baseline[0]) / 1024:.1f}"
+            print(f"{'on' if preload else 'off':<8} {workers:>7} {master_rss / 1024:14.1f} {worker_rss / 1024:14.1f} "
+                  f"{worker_pss / 1024:14.1f} {total_pss / 1024:13.1f} {extra:>24}")
+
+
+if __name__ == "__main__":
+    main()
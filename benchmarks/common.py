@@ -0,0 +1,41 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from data.loader import SHEETS_TO_LOAD, WORKBOOK_PATH, map_unique, parse_outcomes, parse_stewards
+
+
+def load_raw_frame():
+    xlsx = pd.ExcelFile(WORKBOOK_PATH)
+    frames = [
+        pd.read_excel(xlsx, sheet_name=sheet_name)
+        for sheet_name in xlsx.sheet_names
+        if sheet_name in SHEETS_TO_LOAD
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def with_list_columns(df):
+    # The legacy implementations read per-row Python lists that the dataset no
+    # longer carries; its memberships hold the same values as CSR arrays.
+    return df.assign(
+        Stewards_List=map_unique(df["Stewards"], parse_stewards),
+        Outcome_List=map_unique(df["Outcome"], parse_outcomes),
+    )
+
+
+def scale_frame(df, n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    positions = rng.integers(0, len(df), size=n_rows)
+    return df.iloc[positions].reset_index(drop=True)
+
+
+def best_of(func, repeat=3):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
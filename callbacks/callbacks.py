@@ -1,10 +1,15 @@
-from dash import Input, Output, State, callback, ctx, html, no_update
+import json
+from urllib.parse import urlencode
+
+from dash import Input, Output, State, ctx, html, no_update
+from dash import callback as dash_callback
 import dash_bootstrap_components as dbc
 import pandas as pd
 import numpy as np
-from scipy import stats
 
-from data.loader import load_data, filter_data, get_unique_values, get_unique_stewards
+from data.loader import load_data, filter_data, get_cube, get_membership, get_unique_values, get_unique_stewards
+from data.stewards import MIN_PENALTIES, steward_permutation_test, steward_stats, steward_team_bias
+from data.table import PAGE_SIZE, table_page
 from components.filters import format_active_filters
 from components.charts import (
     penalties_by_year, top_drivers, top_teams, allegation_breakdown,
@@ -24,8 +29,10 @@ from layouts.teams import create_team_content
 from layouts.races import create_race_content
 from layouts.stewards import create_steward_content
 from layouts.compare import create_compare_content
-from layouts.raw_data import create_data_table
-import plotly.express as px
+from monitoring.metrics import observed
+
+
+callback = observed(dash_callback)
 
 
 def register_callbacks(app):
@@ -126,11 +133,12 @@ def register_callbacks(app):
         df = load_data()
         filtered = filter_data(df, filters or {})
         
-        total = len(filtered)
-        drivers = filtered["Driver"].nunique()
-        fines = filtered["Fine"].sum()
+        cube = get_cube(filtered)
+        total = cube.total
+        drivers = cube.cells["Driver"].nunique()
+        fines = cube.sum("Fine")
         fines_str = f"€{fines:,.0f}" if pd.notna(fines) and fines > 0 else "€0"
-        pp = filtered["Penalty Points"].sum()
+        pp = cube.sum("Penalty Points")
         pp_str = str(int(pp)) if pd.notna(pp) else "0"
         
         return (
@@ -222,6 +230,8 @@ def register_callbacks(app):
         Input("filter-store", "data"),
     )
     def update_team_stats(team, filters):
+        import plotly.express as px
+        
         if not team:
             empty = empty_figure("Select a team")
             return "0", "0", "€0", "0", empty, empty, empty, None
@@ -237,7 +247,7 @@ def register_callbacks(app):
         fines_str = f"€{fines:,.0f}" if pd.notna(fines) and fines > 0 else "€0"
         drivers = team_df["Driver"].nunique()
         
-        allegation_counts = team_df["Allegation"].value_counts().head(10).reset_index()
+        allegation_counts = team_df["Allegation"].value_counts().loc[lambda c: c > 0].head(10).reset_index()
         allegation_counts.columns = ["Allegation", "Count"]
         
         allegation_fig = px.treemap(
@@ -330,6 +340,7 @@ def register_callbacks(app):
     @callback(
         Output("chart-steward-penalties", "figure"),
         Output("chart-steward-avg-pp", "figure"),
+        Output("steward-bias-table", "children"),
         Input("filter-store", "data"),
     )
     def update_steward_overview(filters):
@@ -339,6 +350,7 @@ def register_callbacks(app):
         return (
             steward_penalties_issued(filtered),
             steward_avg_penalty_points(filtered),
+            create_steward_bias_table(filtered),
         )
     
     @callback(
@@ -365,6 +377,8 @@ def register_callbacks(app):
         Input("filter-store", "data"),
     )
     def update_steward_stats(steward, filters):
+        import plotly.express as px
+        
         if not steward:
             empty = empty_figure()
             return "0", "0", "0.00", "-", empty, empty, empty, empty, None, None
@@ -372,21 +386,21 @@ def register_callbacks(app):
         df = load_data()
         filtered = filter_data(df, filters or {})
         
-        steward_df = filtered[filtered["Stewards_List"].apply(lambda x: steward in x)]
+        steward_df = filtered[get_membership(filtered, "stewards").contains(steward)]
         
-        races = steward_df.groupby(["Year", "Race"]).size().reset_index()
+        races = steward_df.groupby(["Year", "Race"], observed=True).size().reset_index()
         panels = len(races)
         total = len(steward_df)
         
         pp_sum = steward_df["Penalty Points"].sum()
         avg_pp = pp_sum / total if total > 0 else 0
         
-        all_steward_stats = calculate_all_steward_stats(filtered)
+        all_steward_stats = steward_stats(filtered)
         overall_avg = all_steward_stats["Avg_PP"].mean() if len(all_steward_stats) > 0 else 0
         diff_pct = ((avg_pp - overall_avg) / overall_avg * 100) if overall_avg > 0 else 0
         diff_str = f"{diff_pct:+.1f}%"
         
-        allegation_counts = steward_df["Allegation"].value_counts().head(10).reset_index()
+        allegation_counts = steward_df["Allegation"].value_counts().loc[lambda c: c > 0].head(10).reset_index()
         allegation_counts.columns = ["Allegation", "Count"]
         
         allegation_fig = px.treemap(
@@ -487,45 +501,66 @@ def register_callbacks(app):
     
     @callback(
         Output("data-count", "children"),
-        Output("data-table-container", "children"),
+        Output("data-table", "data"),
+        Output("data-table", "page_count"),
+        Output("data-table", "page_current"),
         Input("filter-store", "data"),
+        Input("data-table", "page_current"),
+        Input("data-table", "page_size"),
+        Input("data-table", "sort_by"),
+        Input("data-table", "filter_query"),
     )
-    def update_data_table(filters):
-        df = load_data()
-        filtered = filter_data(df, filters or {})
+    def update_data_table(filters, page_current, page_size, sort_by, filter_query):
+        if "data-table.page_current" not in ctx.triggered_prop_ids:
+            page_current = 0
+        page_size = page_size or PAGE_SIZE
         
-        count_text = f"Showing {len(filtered):,} records"
-        table = create_data_table(filtered)
+        records, total = table_page(filters or {}, filter_query, sort_by, page_current or 0, page_size)
+        page_count = max(1, -(-total // page_size))
         
-        return count_text, table
+        count_text = f"Showing {total:,} records"
+        return count_text, records, page_count, page_current or 0
+    
+    @callback(
+        Output("export-csv", "href"),
+        Output("export-parquet", "href"),
+        Output("export-ndjson", "href"),
+        Input("filter-store", "data"),
+    )
+    def update_export_links(filters):
+        query = f"?{urlencode({'filters': json.dumps(filters)})}" if filters else ""
+        return tuple(f"/export/{fmt}{query}" for fmt in ("csv", "parquet", "ndjson"))
 
 
-def calculate_all_steward_stats(df):
-    all_stewards = set()
-    for sl in df["Stewards_List"]:
-        all_stewards.update(sl)
-    
-    stats_list = []
-    for s in all_stewards:
-        s_df = df[df["Stewards_List"].apply(lambda x: s in x)]
-        if len(s_df) >= 10:
-            pp_sum = s_df["Penalty Points"].sum()
-            avg_pp = pp_sum / len(s_df) if len(s_df) > 0 else 0
-            stats_list.append({
-                "Steward": s,
-                "Count": len(s_df),
-                "Avg_PP": avg_pp,
-                "Total_PP": pp_sum,
-            })
+def create_steward_bias_table(df):
+    bias = steward_team_bias(df)
+    summary = bias.summary[bias.summary["Penalties"] >= MIN_PENALTIES]
+    if summary.empty:
+        return html.P("Not enough data for comparison.", className="text-muted")
     
-    return pd.DataFrame(stats_list) if stats_list else pd.DataFrame()
+    summary = summary.sort_values("p_value", na_position="last", kind="stable")
+    deviation = bias.deviation.loc[summary.index].to_numpy()
+    teams = bias.deviation.columns
+    over = deviation.argmax(axis=1)
+    under = deviation.argmin(axis=1)
+    rows = np.arange(len(summary))
+    
+    table = pd.DataFrame({
+        "Steward": summary.index,
+        "Penalties": summary["Penalties"].to_numpy(),
+        "Chi-square": [f"{v:.2f}" if pd.notna(v) else "N/A" for v in summary["Chi2"]],
+        "p-value": [f"{v:.4f}" if pd.notna(v) else "N/A" for v in summary["p_value"]],
+        "Most Over-represented": [f"{t} ({d:+.0f}%)" for t, d in zip(teams[over], deviation[rows, over])],
+        "Most Under-represented": [f"{t} ({d:+.0f}%)" for t, d in zip(teams[under], deviation[rows, under])],
+    })
+    return dbc.Table.from_dataframe(table, striped=True, bordered=True, hover=True, responsive=True, size="sm")
 
 
 def create_steward_stats_summary(steward_name, steward_df, all_df):
     if steward_df.empty:
         return html.P("No data available.", className="text-muted")
     
-    all_stats = calculate_all_steward_stats(all_df)
+    all_stats = steward_stats(all_df)
     if all_stats.empty:
         return html.P("Not enough data for comparison.", className="text-muted")
     
@@ -538,45 +573,35 @@ def create_steward_stats_summary(steward_name, steward_df, all_df):
     overall_std = all_stats["Avg_PP"].std()
     z_score = (steward_avg_pp - overall_avg) / overall_std if overall_std > 0 else 0
     
-    overall_team_dist = all_df["Team"].value_counts(normalize=True)
-    steward_team_dist = steward_df["Team"].value_counts(normalize=True)
-    
-    chi2_data = []
-    for team in overall_team_dist.index:
-        expected = overall_team_dist.get(team, 0) * len(steward_df)
-        observed = steward_team_dist.get(team, 0) * len(steward_df)
-        if expected > 0:
-            chi2_data.append((observed, expected))
-    
+    bias = steward_team_bias(all_df).summary
+    chi2_str = "N/A"
+    p_str = "N/A"
     p_value = 1.0
-    if len(chi2_data) >= 2:
-        observed_vals = [x[0] for x in chi2_data]
-        expected_vals = [x[1] for x in chi2_data]
-        try:
-            chi2, p_value = stats.chisquare(observed_vals, expected_vals)
-            chi2_str = f"{chi2:.2f}"
-            p_str = f"{p_value:.4f}"
-        except:
-            chi2_str = "N/A"
-            p_str = "N/A"
+    if steward_name in bias.index and pd.notna(bias.at[steward_name, "Chi2"]):
+        p_value = bias.at[steward_name, "p_value"]
+        chi2_str = f"{bias.at[steward_name, 'Chi2']:.2f}"
+        p_str = f"{p_value:.4f}"
+    
+    permutation = steward_permutation_test(all_df)
+    severity_p = permutation.at[steward_name, "p_value"]
+    shuffles = permutation.at[steward_name, "Permutations"]
+    reference_avg = permutation.at[steward_name, "Overall_Avg_PP"]
+    harsh = steward_avg_pp > reference_avg
+    if np.isclose(steward_avg_pp, reference_avg):
+        comparison = "in line with"
     else:
-        chi2_str = "N/A"
-        p_str = "N/A"
+        gap_pct = abs(steward_avg_pp - reference_avg) / reference_avg * 100 if reference_avg > 0 else 0
+        comparison = f"{gap_pct:.0f}% {'above' if harsh else 'below'}"
+    significance = "significant" if severity_p < 0.05 else "not significant"
     
     severity_label = "Average"
     severity_color = "secondary"
-    if z_score > 1.5:
-        severity_label = "Notably Harsh"
-        severity_color = "danger"
-    elif z_score > 0.5:
-        severity_label = "Slightly Harsh"
-        severity_color = "warning"
-    elif z_score < -1.5:
-        severity_label = "Notably Lenient"
-        severity_color = "success"
-    elif z_score < -0.5:
-        severity_label = "Slightly Lenient"
-        severity_color = "info"
+    if severity_p < 0.01:
+        severity_label = "Notably Harsh" if harsh else "Notably Lenient"
+        severity_color = "danger" if harsh else "success"
+    elif severity_p < 0.05:
+        severity_label = "Slightly Harsh" if harsh else "Slightly Lenient"
+        severity_color = "warning" if harsh else "info"
     
     bias_label = "Normal Distribution"
     bias_color = "secondary"
@@ -592,7 +617,11 @@ def create_steward_stats_summary(steward_name, steward_df, all_df):
         dbc.CardBody([
             html.H6("Penalty Severity"),
             dbc.Badge(severity_label, color=severity_color, className="mb-2 me-2"),
-            html.P(f"Z-score: {z_score:.2f} (vs. all stewards)", className="small text-muted mb-3"),
+            html.P(
+                f"Permutation p-value: {severity_p:.4f} ({shuffles:,} shuffles); "
+                f"z-score: {z_score:.2f} (vs. all stewards)",
+                className="small text-muted mb-3"
+            ),
             
             html.H6("Team Distribution Analysis"),
             dbc.Badge(bias_label, color=bias_color, className="mb-2 me-2"),
@@ -601,8 +630,9 @@ def create_steward_stats_summary(steward_name, steward_df, all_df):
             html.H6("Interpretation"),
             html.P(
                 f"This steward's average penalty points per incident ({steward_avg_pp:.2f}) "
-                f"is {abs(z_score):.1f} standard deviations "
-                f"{'above' if z_score > 0 else 'below'} the mean ({overall_avg:.2f}).",
+                f"is {comparison} the average across all penalties in the selection ({reference_avg:.2f}). "
+                f"Randomly reassigning penalty points between panels gives a gap this large "
+                f"{severity_p:.1%} of the time, so the difference is {significance}.",
                 className="small"
             ),
         ])
@@ -616,7 +646,7 @@ def create_driver_penalty_table(df):
     cols = ["Year", "Round", "Race", "Session", "Allegation", "Allegation_Raw", 
             "Outcome", "Time Penalty (in seconds)", "Fine", "Grid Penalty", "Penalty Points", "Notes"]
     display_cols = [c for c in cols if c in df.columns]
-    display_df = df[display_cols].copy()
+    display_df = df[display_cols]
     display_df = display_df.sort_values(["Year", "Round"], ascending=[False, False])
     
     return dbc.Table.from_dataframe(
@@ -636,7 +666,7 @@ def create_team_penalty_table(df):
     cols = ["Year", "Round", "Race", "Driver", "Session", "Allegation", 
             "Outcome", "Time Penalty (in seconds)", "Fine", "Grid Penalty", "Penalty Points"]
     display_cols = [c for c in cols if c in df.columns]
-    display_df = df[display_cols].copy()
+    display_df = df[display_cols]
     display_df = display_df.sort_values(["Year", "Round"], ascending=[False, False])
     
     return dbc.Table.from_dataframe(
@@ -657,7 +687,7 @@ def create_race_penalty_table(df):
             "Incident involving", "Outcome", "Time Penalty (in seconds)", "Fine", 
             "Grid Penalty", "Penalty Points", "Notes", "Stewards"]
     display_cols = [c for c in cols if c in df.columns]
-    display_df = df[display_cols].copy()
+    display_df = df[display_cols]
     display_df = display_df.sort_values(["Year", "Round"], ascending=[False, False])
     
     return dbc.Table.from_dataframe(
@@ -678,7 +708,7 @@ def create_steward_penalty_table(df):
             "Outcome", "Time Penalty (in seconds)", "Fine", "Grid Penalty", 
             "Penalty Points", "Notes"]
     display_cols = [c for c in cols if c in df.columns]
-    display_df = df[display_cols].copy()
+    display_df = df[display_cols]
     display_df = display_df.sort_values(["Year", "Round"], ascending=[False, False])
     
     return dbc.Table.from_dataframe(
@@ -1,16 +1,77 @@
-import plotly.express as px
+import os
+from functools import wraps
+
+import plotly.colors
 import plotly.graph_objects as go
 import pandas as pd
 
+from data.cache import frame_memo
+from monitoring.metrics import observe_chart
+from data.loader import get_cube, get_incidents, get_membership, load_dataset
+from data.stewards import steward_bootstrap_ci, steward_stats, steward_team_bias
 from components.colors import (
-    get_team_color, build_team_color_map, build_driver_color_map,
+    get_team_color, build_team_color_map, driver_color_map,
     get_color_sequence_for_teams, get_color_sequence_for_drivers,
     adjust_color_brightness, TEAM_COLORS, DEFAULT_COLOR
 )
 
 
 CHART_TEMPLATE = "plotly_white"
-COLOR_SEQUENCE = px.colors.qualitative.Set2
+COLOR_SEQUENCE = plotly.colors.qualitative.Set2
+
+FIGURE_CACHE_SIZE = int(os.environ.get("F1_FIGURE_CACHE_SIZE", 512))
+FIGURE_CACHE_BYTES = int(os.environ.get("F1_FIGURE_CACHE_MB", 128)) * 1024 * 1024
+
+
+
+def figure_bytes(value):
+    # Rough size of a figure dict, taken by walking it rather than serializing
+    # it a second time. Trace data arrives as base64 strings or numpy arrays.
+    if isinstance(value, dict):
+        return sum(len(key) + figure_bytes(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return 8 * len(value) + sum(figure_bytes(item) for item in value)
+    if isinstance(value, str):
+        return len(value)
+    return getattr(value, "nbytes", 8)
+
+
+def copy_figure(value):
+    # Fresh dicts and lists around shared leaves: far cheaper than deepcopy,
+    # and enough that a caller editing its figure cannot reach the cached one.
+    if isinstance(value, dict):
+        return {key: copy_figure(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_figure(item) for item in value]
+    if hasattr(value, "setflags"):
+        value.setflags(write=False)
+    return value
+
+
+figure_memo = frame_memo(
+    "figures",
+    maxsize=FIGURE_CACHE_SIZE,
+    max_bytes=FIGURE_CACHE_BYTES,
+    weigher=figure_bytes,
+)
+
+
+def cached_figure(func):
+    # Charts return the serialized figure dict so repeated views of the same
+    # filter state skip plotly construction entirely. Every call gets its own
+    # copy of the cached dict.
+    @wraps(func)
+    def render(df, *args, **kwargs):
+        return func(df, *args, **kwargs).to_dict()
+    
+    memo = figure_memo(render)
+    
+    @wraps(func)
+    def chart(df, *args, **kwargs):
+        return copy_figure(memo(df, *args, **kwargs))
+    
+    chart.cache = memo.cache
+    return observe_chart(chart)
 
 
 def empty_figure(message="No data available"):
@@ -33,11 +94,14 @@ def empty_figure(message="No data available"):
     return fig
 
 
+@cached_figure
 def penalties_by_year(df):
+    import plotly.express as px
+    
     if df.empty:
         return empty_figure()
     
-    yearly = df.groupby("Year").size().reset_index(name="Count")
+    yearly = get_cube(df).totals_by("Year").reset_index(name="Count")
     
     fig = px.bar(
         yearly,
@@ -56,16 +120,17 @@ def penalties_by_year(df):
     return fig
 
 
+@cached_figure
 def top_drivers(df, n=10):
     if df.empty:
         return empty_figure()
     
-    driver_counts = df["Driver"].value_counts().head(n).reset_index()
+    driver_counts = get_cube(df).totals_by("Driver").sort_values(ascending=False, kind="stable").head(n).reset_index()
     driver_counts.columns = ["Driver", "Count"]
     driver_counts = driver_counts.sort_values("Count", ascending=True)
     
-    driver_color_map = build_driver_color_map(df)
-    colors = [driver_color_map.get(d, DEFAULT_COLOR) for d in driver_counts["Driver"]]
+    driver_colors = driver_color_map()
+    colors = [driver_colors.get(d, DEFAULT_COLOR) for d in driver_counts["Driver"]]
     
     fig = go.Figure(go.Bar(
         x=driver_counts["Count"],
@@ -83,11 +148,12 @@ def top_drivers(df, n=10):
     return fig
 
 
+@cached_figure
 def top_teams(df, n=10):
     if df.empty:
         return empty_figure()
     
-    team_counts = df["Team"].value_counts().head(n).reset_index()
+    team_counts = get_cube(df).totals_by("Team").sort_values(ascending=False, kind="stable").head(n).reset_index()
     team_counts.columns = ["Team", "Count"]
     team_counts = team_counts.sort_values("Count", ascending=True)
     
@@ -109,11 +175,14 @@ def top_teams(df, n=10):
     return fig
 
 
+@cached_figure
 def allegation_breakdown(df, n=10):
+    import plotly.express as px
+    
     if df.empty:
         return empty_figure()
     
-    allegation_counts = df["Allegation"].value_counts().head(n).reset_index()
+    allegation_counts = get_cube(df).totals_by("Allegation").sort_values(ascending=False, kind="stable").head(n).reset_index()
     allegation_counts.columns = ["Allegation", "Count"]
     
     fig = px.treemap(
@@ -131,19 +200,20 @@ def allegation_breakdown(df, n=10):
     return fig
 
 
+@cached_figure
 def outcome_breakdown(df):
+    import plotly.express as px
+    
     if df.empty:
         return empty_figure()
     
-    outcome_counts = {}
-    for outcome_list in df["Outcome_List"]:
-        for outcome in outcome_list:
-            outcome_counts[outcome] = outcome_counts.get(outcome, 0) + 1
+    outcome_counts = get_cube(df).outcome_counts()
+    outcome_counts = outcome_counts[outcome_counts > 0]
     
-    if not outcome_counts:
+    if outcome_counts.empty:
         return empty_figure()
     
-    outcome_df = pd.DataFrame(list(outcome_counts.items()), columns=["Outcome", "Count"])
+    outcome_df = outcome_counts.rename_axis("Outcome").reset_index()
     outcome_df = outcome_df.sort_values("Count", ascending=True)
     
     fig = px.bar(
@@ -164,17 +234,18 @@ def outcome_breakdown(df):
     return fig
 
 
+@cached_figure
 def penalty_points_by_driver(df, n=10):
     if df.empty:
         return empty_figure()
     
-    pp_by_driver = df.groupby("Driver")["Penalty Points"].sum().sort_values(ascending=False).head(n)
+    pp_by_driver = get_cube(df).totals_by("Driver", "Penalty Points").sort_values(ascending=False).head(n)
     pp_df = pp_by_driver.reset_index()
     pp_df.columns = ["Driver", "Penalty Points"]
     pp_df = pp_df.sort_values("Penalty Points", ascending=True)
     
-    driver_color_map = build_driver_color_map(df)
-    colors = [driver_color_map.get(d, DEFAULT_COLOR) for d in pp_df["Driver"]]
+    driver_colors = driver_color_map()
+    colors = [driver_colors.get(d, DEFAULT_COLOR) for d in pp_df["Driver"]]
     
     fig = go.Figure(go.Bar(
         x=pp_df["Penalty Points"],
@@ -192,14 +263,19 @@ def penalty_points_by_driver(df, n=10):
     return fig
 
 
+@cached_figure
 def driver_timeline(df, driver_name):
-    driver_df = df[df["Driver"] == driver_name].copy()
+    import plotly.express as px
+    
+    columns = ["Year", "Round", "Race", "Session", "Team", "Allegation", "Penalty Points"]
+    driver_df = df.loc[df["Driver"] == driver_name, columns]
     if driver_df.empty:
         return empty_figure(f"No data for {driver_name}")
     
     driver_df = driver_df.sort_values(["Year", "Round"])
-    driver_df["Race_Label"] = driver_df["Year"].astype(str) + " R" + driver_df["Round"].astype(str)
-    driver_df["Team_Color"] = driver_df["Team"].apply(get_team_color)
+    driver_df = driver_df.assign(
+        Race_Label=driver_df["Year"].astype(str) + " R" + driver_df["Round"].astype(str),
+    )
     
     fig = px.scatter(
         driver_df,
@@ -221,12 +297,15 @@ def driver_timeline(df, driver_name):
     return fig
 
 
+@cached_figure
 def driver_allegation_breakdown(df, driver_name):
+    import plotly.express as px
+    
     driver_df = df[df["Driver"] == driver_name]
     if driver_df.empty:
         return empty_figure(f"No data for {driver_name}")
     
-    allegation_counts = driver_df["Allegation"].value_counts().reset_index()
+    allegation_counts = driver_df["Allegation"].value_counts().loc[lambda c: c > 0].reset_index()
     allegation_counts.columns = ["Allegation", "Count"]
     
     fig = px.treemap(
@@ -244,15 +323,17 @@ def driver_allegation_breakdown(df, driver_name):
     return fig
 
 
+@cached_figure
 def driver_cumulative_points(df, driver_name):
-    driver_df = df[df["Driver"] == driver_name].copy()
+    driver_df = df.loc[df["Driver"] == driver_name, ["Year", "Round", "Team", "Penalty Points"]]
     if driver_df.empty:
         return empty_figure(f"No data for {driver_name}")
     
     driver_df = driver_df.sort_values(["Year", "Round"])
-    driver_df["Penalty Points"] = driver_df["Penalty Points"].fillna(0)
-    driver_df["Cumulative_PP"] = driver_df["Penalty Points"].cumsum()
-    driver_df["Race_Label"] = driver_df["Year"].astype(str) + " R" + driver_df["Round"].astype(str)
+    driver_df = driver_df.assign(
+        Cumulative_PP=driver_df["Penalty Points"].fillna(0).cumsum(),
+        Race_Label=driver_df["Year"].astype(str) + " R" + driver_df["Round"].astype(str),
+    )
     
     most_recent_team = driver_df["Team"].iloc[-1]
     line_color = get_team_color(most_recent_team)
@@ -275,12 +356,13 @@ def driver_cumulative_points(df, driver_name):
     return fig
 
 
+@cached_figure
 def team_drivers_breakdown(df, team_name):
     team_df = df[df["Team"] == team_name]
     if team_df.empty:
         return empty_figure(f"No data for {team_name}")
     
-    driver_counts = team_df["Driver"].value_counts().reset_index()
+    driver_counts = team_df["Driver"].value_counts().loc[lambda c: c > 0].reset_index()
     driver_counts.columns = ["Driver", "Count"]
     
     base_color = get_team_color(team_name)
@@ -305,12 +387,13 @@ def team_drivers_breakdown(df, team_name):
     return fig
 
 
+@cached_figure
 def team_yearly_trend(df, team_name):
     team_df = df[df["Team"] == team_name]
     if team_df.empty:
         return empty_figure(f"No data for {team_name}")
     
-    yearly = team_df.groupby("Year").size().reset_index(name="Count")
+    yearly = team_df.groupby("Year", observed=True).size().reset_index(name="Count")
     team_color = get_team_color(team_name)
     
     fig = go.Figure(go.Scatter(
@@ -331,12 +414,13 @@ def team_yearly_trend(df, team_name):
     return fig
 
 
+@cached_figure
 def race_summary(df, year, race):
     race_df = df[(df["Year"] == year) & (df["Race"] == race)]
     if race_df.empty:
         return empty_figure(f"No data for {year} {race}")
     
-    driver_counts = race_df.groupby(["Driver", "Team"]).size().reset_index(name="Count")
+    driver_counts = race_df.groupby(["Driver", "Team"], observed=True).size().reset_index(name="Count")
     driver_counts = driver_counts.sort_values("Count", ascending=False)
     
     colors = [get_team_color(t) for t in driver_counts["Team"]]
@@ -356,16 +440,16 @@ def race_summary(df, year, race):
     return fig
 
 
+@cached_figure
 def steward_penalties_issued(df, n=15):
-    if df.empty or df["Stewards_List"].apply(len).sum() == 0:
-        return empty_figure("No steward data available")
+    import plotly.express as px
     
-    steward_counts = {}
-    for stewards in df["Stewards_List"]:
-        for steward in stewards:
-            steward_counts[steward] = steward_counts.get(steward, 0) + 1
+    membership = get_membership(df, "stewards")
+    if df.empty or membership.nnz == 0:
+        return empty_figure("No steward data available")
     
-    steward_df = pd.DataFrame(list(steward_counts.items()), columns=["Steward", "Count"])
+    steward_counts = membership.counts()
+    steward_df = steward_counts[steward_counts > 0].rename_axis("Steward").reset_index()
     steward_df = steward_df.sort_values("Count", ascending=True).tail(n)
     
     fig = px.bar(
@@ -385,24 +469,22 @@ def steward_penalties_issued(df, n=15):
     return fig
 
 
+@cached_figure
 def steward_avg_penalty_points(df, min_penalties=5):
-    if df.empty or df["Stewards_List"].apply(len).sum() == 0:
+    import plotly.express as px
+    
+    membership = get_membership(df, "stewards")
+    if df.empty or membership.nnz == 0:
         return empty_figure("No steward data available")
     
-    steward_stats = {}
-    for _, row in df.iterrows():
-        pp = row["Penalty Points"] if pd.notna(row["Penalty Points"]) else 0
-        for steward in row["Stewards_List"]:
-            if steward not in steward_stats:
-                steward_stats[steward] = {"total_pp": 0, "count": 0}
-            steward_stats[steward]["total_pp"] += pp
-            steward_stats[steward]["count"] += 1
-    
-    steward_df = pd.DataFrame([
-        {"Steward": k, "Avg PP": v["total_pp"] / v["count"], "Count": v["count"]}
-        for k, v in steward_stats.items()
-        if v["count"] >= min_penalties
-    ])
+    counts = membership.counts()
+    total_pp = membership.weighted_sums(df["Penalty Points"].fillna(0).to_numpy(dtype=float))
+    steward_df = pd.DataFrame({
+        "Steward": counts.index,
+        "Avg PP": (total_pp / counts.where(counts > 0)).to_numpy(),
+        "Count": counts.to_numpy(),
+    })
+    steward_df = steward_df[steward_df["Count"] >= min_penalties]
     
     if steward_df.empty:
         return empty_figure("Not enough data")
@@ -427,6 +509,7 @@ def steward_avg_penalty_points(df, min_penalties=5):
     return fig
 
 
+@cached_figure
 def comparison_bar(df, entity_col, entities, metric="count"):
     if df.empty or not entities:
         return empty_figure("Select items to compare")
@@ -434,13 +517,13 @@ def comparison_bar(df, entity_col, entities, metric="count"):
     filtered = df[df[entity_col].isin(entities)]
     
     if metric == "count":
-        data = filtered.groupby(entity_col).size().reset_index(name="Value")
+        data = filtered.groupby(entity_col, observed=True).size().reset_index(name="Value")
         title = "Total Penalties Comparison"
     elif metric == "penalty_points":
-        data = filtered.groupby(entity_col)["Penalty Points"].sum().reset_index(name="Value")
+        data = filtered.groupby(entity_col, observed=True)["Penalty Points"].sum().reset_index(name="Value")
         title = "Total Penalty Points Comparison"
     elif metric == "fines":
-        data = filtered.groupby(entity_col)["Fine"].sum().reset_index(name="Value")
+        data = filtered.groupby(entity_col, observed=True)["Fine"].sum().reset_index(name="Value")
         title = "Total Fines Comparison"
     else:
         return empty_figure()
@@ -448,8 +531,8 @@ def comparison_bar(df, entity_col, entities, metric="count"):
     if entity_col == "Team":
         colors = [get_team_color(e) for e in data[entity_col]]
     else:
-        driver_color_map = build_driver_color_map(df)
-        colors = [driver_color_map.get(e, DEFAULT_COLOR) for e in data[entity_col]]
+        driver_colors = driver_color_map()
+        colors = [driver_colors.get(e, DEFAULT_COLOR) for e in data[entity_col]]
     
     fig = go.Figure(go.Bar(
         x=data[entity_col],
@@ -466,19 +549,22 @@ def comparison_bar(df, entity_col, entities, metric="count"):
     return fig
 
 
+@cached_figure
 def comparison_allegation(df, entity_col, entities):
+    import plotly.express as px
+    
     if df.empty or not entities:
         return empty_figure("Select items to compare")
     
     filtered = df[df[entity_col].isin(entities)]
     
-    allegation_data = filtered.groupby([entity_col, "Allegation"]).size().reset_index(name="Count")
+    allegation_data = filtered.groupby([entity_col, "Allegation"], observed=True).size().reset_index(name="Count")
     
     if entity_col == "Team":
         color_map = {e: get_team_color(e) for e in entities}
     else:
-        driver_color_map = build_driver_color_map(df)
-        color_map = {e: driver_color_map.get(e, DEFAULT_COLOR) for e in entities}
+        driver_colors = driver_color_map()
+        color_map = {e: driver_colors.get(e, DEFAULT_COLOR) for e in entities}
     
     fig = px.bar(
         allegation_data,
@@ -506,18 +592,19 @@ def comparison_allegation(df, entity_col, entities):
     return fig
 
 
+@cached_figure
 def comparison_yearly_trend(df, entity_col, entities):
     if df.empty or not entities:
         return empty_figure("Select items to compare")
     
     filtered = df[df[entity_col].isin(entities)]
-    yearly = filtered.groupby([entity_col, "Year"]).size().reset_index(name="Count")
+    yearly = filtered.groupby([entity_col, "Year"], observed=True).size().reset_index(name="Count")
     
     if entity_col == "Team":
         color_map = {e: get_team_color(e) for e in entities}
     else:
-        driver_color_map = build_driver_color_map(df)
-        color_map = {e: driver_color_map.get(e, DEFAULT_COLOR) for e in entities}
+        driver_colors = driver_color_map()
+        color_map = {e: driver_colors.get(e, DEFAULT_COLOR) for e in entities}
     
     fig = go.Figure()
     for entity in entities:
@@ -549,27 +636,22 @@ def comparison_yearly_trend(df, entity_col, entities):
     return fig
 
 
+@cached_figure
 def driver_incidents_with(df, driver_name, n=10):
-    driver_df = df[df["Driver"] == driver_name]
-    if driver_df.empty:
+    graph = get_incidents(df)
+    if not graph.has_penalties(driver_name):
         return empty_figure(f"No data for {driver_name}")
     
-    incidents = driver_df["Incident involving"].dropna()
-    if incidents.empty:
+    partners = graph.partners_of(driver_name)
+    if partners.empty:
         return empty_figure("No incident data available")
     
-    incident_counts = incidents.value_counts().head(n).reset_index()
+    incident_counts = partners.sort_values(ascending=False, kind="stable").head(n).reset_index()
     incident_counts.columns = ["Other Driver", "Count"]
     incident_counts = incident_counts.sort_values("Count", ascending=True)
     
-    other_drivers = incident_counts["Other Driver"].tolist()
-    colors = []
-    for other in other_drivers:
-        other_team = df[df["Driver"] == other]["Team"].mode()
-        if len(other_team) > 0:
-            colors.append(get_team_color(other_team.iloc[0]))
-        else:
-            colors.append(DEFAULT_COLOR)
+    modal_teams = load_dataset().incidents.teams
+    colors = [get_team_color(modal_teams.get(other)) for other in incident_counts["Other Driver"]]
     
     fig = go.Figure(go.Bar(
         x=incident_counts["Count"],
@@ -587,17 +669,18 @@ def driver_incidents_with(df, driver_name, n=10):
     return fig
 
 
+@cached_figure
 def driver_involved_in_others(df, driver_name):
-    involved_df = df[df["Incident involving"] == driver_name]
-    if involved_df.empty:
+    involved = get_incidents(df).involving(driver_name)
+    if involved.empty:
         return empty_figure(f"No incidents involving {driver_name}")
     
-    other_drivers = involved_df["Driver"].value_counts().reset_index()
+    other_drivers = involved.sort_values(ascending=False, kind="stable").reset_index()
     other_drivers.columns = ["Driver", "Count"]
     other_drivers = other_drivers.sort_values("Count", ascending=True)
     
-    driver_color_map = build_driver_color_map(df)
-    colors = [driver_color_map.get(d, DEFAULT_COLOR) for d in other_drivers["Driver"]]
+    driver_colors = driver_color_map()
+    colors = [driver_colors.get(d, DEFAULT_COLOR) for d in other_drivers["Driver"]]
     
     fig = go.Figure(go.Bar(
         x=other_drivers["Count"],
@@ -615,13 +698,16 @@ def driver_involved_in_others(df, driver_name):
     return fig
 
 
+@cached_figure
 def race_penalties_by_year(df, race_name):
+    import plotly.express as px
+    
     race_df = df[df["Race"] == race_name]
     if race_df.empty:
         return empty_figure(f"No data for {race_name}")
     
-    yearly = race_df.groupby("Year").size().reset_index(name="Count")
-    yearly["Year"] = yearly["Year"].astype(str)
+    yearly = race_df.groupby("Year", observed=True).size().reset_index(name="Count")
+    yearly = yearly.assign(Year=yearly["Year"].astype(str))
     
     fig = px.bar(
         yearly,
@@ -641,16 +727,19 @@ def race_penalties_by_year(df, race_name):
     return fig
 
 
+@cached_figure
 def race_drivers_by_year(df, race_name):
+    import plotly.express as px
+    
     race_df = df[df["Race"] == race_name]
     if race_df.empty:
         return empty_figure(f"No data for {race_name}")
     
-    driver_year = race_df.groupby(["Driver", "Year", "Team"]).size().reset_index(name="Count")
-    driver_totals = driver_year.groupby("Driver")["Count"].sum().sort_values(ascending=False)
+    driver_year = race_df.groupby(["Driver", "Year", "Team"], observed=True).size().reset_index(name="Count")
+    driver_totals = driver_year.groupby("Driver", observed=True)["Count"].sum().sort_values(ascending=False)
     top_drivers = driver_totals.head(10).index.tolist()
     driver_year = driver_year[driver_year["Driver"].isin(top_drivers)]
-    driver_year["Year"] = driver_year["Year"].astype(str)
+    driver_year = driver_year.assign(Year=driver_year["Year"].astype(str))
     
     driver_order = driver_totals.head(10).index.tolist()[::-1]
     
@@ -675,16 +764,19 @@ def race_drivers_by_year(df, race_name):
     return fig
 
 
+@cached_figure
 def race_allegations_by_year(df, race_name):
+    import plotly.express as px
+    
     race_df = df[df["Race"] == race_name]
     if race_df.empty:
         return empty_figure(f"No data for {race_name}")
     
-    allegation_year = race_df.groupby(["Allegation", "Year"]).size().reset_index(name="Count")
-    allegation_totals = allegation_year.groupby("Allegation")["Count"].sum().sort_values(ascending=False)
+    allegation_year = race_df.groupby(["Allegation", "Year"], observed=True).size().reset_index(name="Count")
+    allegation_totals = allegation_year.groupby("Allegation", observed=True)["Count"].sum().sort_values(ascending=False)
     top_allegations = allegation_totals.head(10).index.tolist()
     allegation_year = allegation_year[allegation_year["Allegation"].isin(top_allegations)]
-    allegation_year["Year"] = allegation_year["Year"].astype(str)
+    allegation_year = allegation_year.assign(Year=allegation_year["Year"].astype(str))
     
     fig = px.treemap(
         allegation_year,
@@ -700,13 +792,16 @@ def race_allegations_by_year(df, race_name):
     return fig
 
 
+@cached_figure
 def steward_team_driver_breakdown(df, steward_name):
-    steward_df = df[df["Stewards_List"].apply(lambda x: steward_name in x)]
+    import plotly.express as px
+    
+    steward_df = df[get_membership(df, "stewards").contains(steward_name)]
     if steward_df.empty:
         return empty_figure(f"No data for {steward_name}")
     
-    team_driver = steward_df.groupby(["Team", "Driver"]).size().reset_index(name="Count")
-    team_totals = team_driver.groupby("Team")["Count"].sum().sort_values(ascending=False)
+    team_driver = steward_df.groupby(["Team", "Driver"], observed=True).size().reset_index(name="Count")
+    team_totals = team_driver.groupby("Team", observed=True)["Count"].sum().sort_values(ascending=False)
     team_order = team_totals.index.tolist()[::-1]
     
     colors_map = {}
@@ -738,32 +833,15 @@ def steward_team_driver_breakdown(df, steward_name):
     return fig
 
 
+@cached_figure
 def steward_statistical_comparison(df, steward_name):
-    steward_df = df[df["Stewards_List"].apply(lambda x: steward_name in x)]
-    if steward_df.empty:
+    if not get_membership(df, "stewards").contains(steward_name).any():
         return empty_figure(f"No data for {steward_name}")
     
-    all_steward_stats = []
-    all_stewards = set()
-    for sl in df["Stewards_List"]:
-        all_stewards.update(sl)
-    
-    for s in all_stewards:
-        s_df = df[df["Stewards_List"].apply(lambda x: s in x)]
-        if len(s_df) >= 10:
-            pp_sum = s_df["Penalty Points"].sum()
-            avg_pp = pp_sum / len(s_df) if len(s_df) > 0 else 0
-            all_steward_stats.append({
-                "Steward": s,
-                "Count": len(s_df),
-                "Avg_PP": avg_pp,
-                "Total_PP": pp_sum,
-            })
-    
-    if not all_steward_stats:
+    stats_df = steward_stats(df)
+    if stats_df.empty:
         return empty_figure("Not enough data")
     
-    stats_df = pd.DataFrame(all_steward_stats)
     avg_pp_mean = stats_df["Avg_PP"].mean()
     avg_pp_std = stats_df["Avg_PP"].std()
     
@@ -774,16 +852,26 @@ def steward_statistical_comparison(df, steward_name):
     steward_avg_pp = steward_row["Avg_PP"].values[0]
     z_score = (steward_avg_pp - avg_pp_mean) / avg_pp_std if avg_pp_std > 0 else 0
     
-    stats_df["Highlight"] = stats_df["Steward"].apply(lambda x: "Selected" if x == steward_name else "Other")
-    stats_df = stats_df.sort_values("Avg_PP", ascending=True)
+    intervals = steward_bootstrap_ci(df)[["Steward", "CI_Low", "CI_High"]]
+    stats_df = stats_df.merge(intervals, on="Steward", how="left")
+    stats_df = stats_df.sort_values("Avg_PP", ascending=True, kind="stable")
     
-    colors = ["#E8002D" if h == "Selected" else "#cccccc" for h in stats_df["Highlight"]]
+    colors = ["#E8002D" if s == steward_name else "#cccccc" for s in stats_df["Steward"]]
     
     fig = go.Figure(go.Bar(
         x=stats_df["Avg_PP"],
         y=stats_df["Steward"],
         orientation="h",
         marker_color=colors,
+        error_x=dict(
+            type="data",
+            symmetric=False,
+            array=stats_df["CI_High"] - stats_df["Avg_PP"],
+            arrayminus=stats_df["Avg_PP"] - stats_df["CI_Low"],
+            color="#555555",
+            thickness=1,
+            width=3,
+        ),
     ))
     
     fig.add_vline(x=avg_pp_mean, line_dash="dash", line_color="black", annotation_text="Average")
@@ -793,7 +881,7 @@ def steward_statistical_comparison(df, steward_name):
                       fillcolor="gray", opacity=0.1, line_width=0)
     
     fig.update_layout(
-        title=f"Avg Penalty Points per Incident (z-score: {z_score:.2f})",
+        title=f"Avg Penalty Points per Incident, 95% bootstrap CI (z-score: {z_score:.2f})",
         xaxis_title="Avg Penalty Points",
         yaxis_title="",
         template=CHART_TEMPLATE,
@@ -803,26 +891,17 @@ def steward_statistical_comparison(df, steward_name):
     return fig
 
 
+@cached_figure
 def steward_team_bias_analysis(df, steward_name):
-    steward_df = df[df["Stewards_List"].apply(lambda x: steward_name in x)]
-    if steward_df.empty:
+    bias = steward_team_bias(df)
+    if steward_name not in bias.deviation.index:
         return empty_figure(f"No data for {steward_name}")
     
-    overall_team_dist = df["Team"].value_counts(normalize=True)
-    steward_team_dist = steward_df["Team"].value_counts(normalize=True)
-    
     comparison = pd.DataFrame({
-        "Team": overall_team_dist.index,
-        "Overall": overall_team_dist.values,
+        "Team": bias.overall.index,
+        "Difference": bias.deviation.loc[steward_name].round(1).to_numpy(),
     })
-    comparison = comparison.merge(
-        pd.DataFrame({"Team": steward_team_dist.index, "Steward": steward_team_dist.values}),
-        on="Team",
-        how="left"
-    ).fillna(0)
-    
-    comparison["Difference"] = ((comparison["Steward"] - comparison["Overall"]) / comparison["Overall"] * 100).round(1)
-    comparison = comparison.sort_values("Difference", ascending=True)
+    comparison = comparison.sort_values("Difference", ascending=True, kind="stable")
     
     colors = [get_team_color(t) for t in comparison["Team"]]
     
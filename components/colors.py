@@ -1,3 +1,8 @@
+from data.cache import LRUCache
+from data.graph import modal_teams
+from data.loader import load_dataset
+
+
 TEAM_COLORS = {
     "Red Bull": "#3671C6",
     "Mercedes": "#6CD3BF",
@@ -20,6 +25,8 @@ TEAM_COLORS = {
 
 DEFAULT_COLOR = "#666666"
 
+color_cache = LRUCache("color_maps", maxsize=8)
+
 
 def get_team_color(team_name):
     if not team_name:
@@ -64,7 +71,7 @@ def build_team_color_map(df):
 def build_driver_color_map(df):
     color_map = {}
     
-    driver_teams = df.groupby("Driver")["Team"].agg(lambda x: x.mode().iloc[0] if len(x.mode()) > 0 else x.iloc[0])
+    driver_teams = modal_teams(df)
     
     team_drivers = {}
     for driver, team in driver_teams.items():
@@ -79,10 +86,18 @@ def build_driver_color_map(df):
     return color_map
 
 
+def driver_color_map():
+    dataset = load_dataset()
+    return color_cache.get_or_compute(
+        (dataset.version, "drivers"),
+        lambda: build_driver_color_map(dataset.df),
+    )
+
+
 def get_color_sequence_for_teams(teams):
     return [get_team_color(team) for team in teams]
 
 
-def get_color_sequence_for_drivers(drivers, df):
-    color_map = build_driver_color_map(df)
+def get_color_sequence_for_drivers(drivers):
+    color_map = driver_color_map()
     return [color_map.get(driver, DEFAULT_COLOR) for driver in drivers]
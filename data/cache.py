@@ -0,0 +1,147 @@
+import threading
+import weakref
+from collections import OrderedDict
+from functools import wraps
+
+
+CACHES = []
+
+_frame_signatures = {}
+
+
+class LRUCache:
+    def __init__(self, name, maxsize=128, max_bytes=None, weigher=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.weigher = weigher
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        CACHES.append(self)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key, compute):
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key][0]
+                pending = self._pending.get(key)
+                if pending is None:
+                    self.misses += 1
+                    pending = self._pending[key] = threading.Event()
+                    break
+            # Another thread is already computing this key: wait for it and
+            # look again, rather than repeating the work.
+            pending.wait()
+
+        try:
+            value = compute()
+            self.put(key, value)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+        return value
+
+    def put(self, key, value):
+        size = self.weigher(value) if self.weigher else 0
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            while self._entries and (
+                len(self._entries) > self.maxsize
+                or (self.max_bytes is not None and self.nbytes > self.max_bytes and len(self._entries) > 1)
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def info(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def canonical_filters(filters, keys):
+    signature = []
+    for key in sorted(keys):
+        values = (filters or {}).get(key)
+        if values:
+            signature.append((key, tuple(sorted(set(values), key=str))))
+    return tuple(signature)
+
+
+def register_frame(df, signature):
+    key = id(df)
+
+    def forget(_ref):
+        entry = _frame_signatures.get(key)
+        if entry is not None and entry[0] is _ref:
+            del _frame_signatures[key]
+
+    _frame_signatures[key] = (weakref.ref(df, forget), signature)
+    return df
+
+
+def frame_signature(df):
+    entry = _frame_signatures.get(id(df))
+    if entry is None or entry[0]() is not df:
+        return None
+    return entry[1]
+
+
+def freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, set):
+        return tuple(sorted(value, key=str))
+    return value
+
+
+def frame_memo(name, maxsize=64, max_bytes=None, weigher=None):
+    # Memoizes func(df, ...) for frames produced by filter_data, keyed by the
+    # function, the dataset version and canonical filter signature the frame
+    # was built from, and the remaining arguments.
+    cache = LRUCache(name, maxsize=maxsize, max_bytes=max_bytes, weigher=weigher)
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(df, *args, **kwargs):
+            signature = frame_signature(df)
+            if signature is None:
+                return func(df, *args, **kwargs)
+            key = (func.__name__, signature, freeze(args), freeze(kwargs))
+            return cache.get_or_compute(key, lambda: func(df, *args, **kwargs))
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+from functools import cached_property
+
+from data.index import BitmapIndex
+
+
+DIMENSIONS = ["Year", "Race", "Session", "Driver", "Team", "Allegation", "Outcome"]
+MEASURES = ["Penalty Points", "Fine", "Time Penalty (in seconds)"]
+
+
+class PenaltyCube:
+    # One row per distinct (Year, Race, Session, Driver, Team, Allegation,
+    # Outcome) combination with its penalty count and measure sums. Outcome is
+    # kept as the raw outcome string, so cells stay row-exclusive and outcome
+    # counts come from the cell membership weighted by Count.
+
+    def __init__(self, cells, outcomes, row_cells=None, filter_columns=None):
+        self.cells = cells
+        self.outcomes = outcomes
+        self.row_cells = row_cells
+        self.filter_columns = filter_columns
+
+    @classmethod
+    def build(cls, df, outcomes, filter_columns=None):
+        keys = []
+        sizes = []
+        for column in DIMENSIONS:
+            codes, uniques = pd.factorize(df[column], use_na_sentinel=True)
+            keys.append(codes + 1)
+            sizes.append(len(uniques) + 1)
+
+        flat = np.ravel_multi_index(keys, sizes) if len(df) else np.zeros(0, dtype=np.int64)
+        _, first, row_cells = np.unique(flat, return_index=True, return_inverse=True)
+        cells = aggregate(df[DIMENSIONS].iloc[first], row_cells, df)
+        return cls(cells, outcomes.take(first), row_cells, filter_columns)
+
+    @cached_property
+    def bitmaps(self):
+        return BitmapIndex.build(self.cells, self.filter_columns, {"outcomes": self.outcomes})
+
+    def slice(self, filters):
+        positions = self.bitmaps.resolve(filters)
+        return PenaltyCube(self.cells.iloc[positions].reset_index(drop=True), self.outcomes.take(positions))
+
+    def for_rows(self, df):
+        # Re-aggregate a subset of the rows the cube was built from (e.g. a
+        # steward filter) without re-encoding the dimension columns.
+        row_cells = self.row_cells[df.index.to_numpy()]
+        present, row_cells = np.unique(row_cells, return_inverse=True)
+        cells = aggregate(self.cells[DIMENSIONS].iloc[present], row_cells, df)
+        return PenaltyCube(cells, self.outcomes.take(present))
+
+    @property
+    def total(self):
+        return int(self.cells["Count"].sum())
+
+    def sum(self, column):
+        return self.cells[column].sum()
+
+    def totals_by(self, column, measure="Count"):
+        codes, uniques = pd.factorize(self.cells[column], sort=True)
+        keep = codes >= 0
+        weights = self.cells[measure].to_numpy()[keep]
+        sums = np.bincount(codes[keep], weights=weights, minlength=len(uniques))
+        return pd.Series(
+            sums.astype(weights.dtype),
+            index=pd.Index(uniques, name=column),
+            name=measure,
+        )
+
+    def outcome_counts(self):
+        return self.outcomes.weighted_sums(self.cells["Count"].to_numpy()).astype(np.int64).rename("Count")
+
+
+def aggregate(keys, row_cells, df):
+    n_cells = len(keys)
+    cells = keys.reset_index(drop=True)
+    cells["Count"] = np.bincount(row_cells, minlength=n_cells)
+    for column in MEASURES:
+        weights = df[column].fillna(0).to_numpy(dtype=float)
+        sums = np.bincount(row_cells, weights=weights, minlength=n_cells)
+        if pd.api.types.is_integer_dtype(df[column].dtype):
+            sums = sums.astype(np.int64)
+        cells[column] = sums
+    return cells
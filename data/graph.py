@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+
+class IncidentGraph:
+    # Weighted driver x driver incident adjacency: entry (i, j) counts the
+    # penalties given to drivers[i] for incidents involving drivers[j].
+    # penalties[i] is the total number of penalties given to drivers[i].
+
+    def __init__(self, drivers, matrix, penalties):
+        self.drivers = drivers
+        self.matrix = matrix
+        self.penalties = penalties
+        self.lookup = {driver: code for code, driver in enumerate(drivers)}
+
+    @classmethod
+    def from_frame(cls, df, drivers):
+        from scipy import sparse
+
+        driver_codes = encode_drivers(df["Driver"], drivers)
+        partner_codes = encode_drivers(df["Incident involving"], drivers)
+        n = len(drivers)
+
+        penalties = np.bincount(driver_codes[driver_codes >= 0], minlength=n)
+        edges = (driver_codes >= 0) & (partner_codes >= 0)
+        matrix = sparse.csr_matrix(
+            (np.ones(int(edges.sum()), dtype=np.int64), (driver_codes[edges], partner_codes[edges])),
+            shape=(n, n),
+        )
+        matrix.sum_duplicates()
+        return cls(drivers, matrix, penalties)
+
+    def has_penalties(self, driver):
+        code = self.lookup.get(driver)
+        return code is not None and self.penalties[code] > 0
+
+    def partners_of(self, driver):
+        code = self.lookup.get(driver)
+        if code is None:
+            return pd.Series(dtype=np.int64, name="Count")
+        row = self.matrix.getrow(code)
+        return pd.Series(row.data, index=self.drivers[row.indices], name="Count")
+
+    def involving(self, driver):
+        code = self.lookup.get(driver)
+        if code is None:
+            return pd.Series(dtype=np.int64, name="Count")
+        column = self.matrix.getcol(code).tocsc()
+        return pd.Series(column.data, index=self.drivers[column.indices], name="Count")
+
+
+class IncidentIndex:
+    # Incident graphs split by season and built once per dataset, plus each
+    # driver's modal team. Year-only selections sum the per-year matrices.
+
+    def __init__(self, drivers, total, by_year, teams):
+        self.drivers = drivers
+        self.total = total
+        self.by_year = by_year
+        self.teams = teams
+
+    @classmethod
+    def build(cls, df):
+        drivers = driver_vocabulary(df)
+        by_year = {
+            year: IncidentGraph.from_frame(df.iloc[positions], drivers)
+            for year, positions in df.groupby("Year", observed=True).indices.items()
+        }
+        return cls(drivers, IncidentGraph.from_frame(df, drivers), by_year, modal_teams(df))
+
+    def for_years(self, years=None):
+        from scipy import sparse
+
+        if not years:
+            return self.total
+        graphs = [self.by_year[year] for year in years if year in self.by_year]
+        n = len(self.drivers)
+        matrix = sum((graph.matrix for graph in graphs), sparse.csr_matrix((n, n), dtype=np.int64))
+        penalties = sum((graph.penalties for graph in graphs), np.zeros(n, dtype=np.int64))
+        return IncidentGraph(self.drivers, sparse.csr_matrix(matrix), penalties)
+
+    def for_frame(self, df):
+        return IncidentGraph.from_frame(df, self.drivers)
+
+
+def driver_vocabulary(df):
+    if isinstance(df["Driver"].dtype, pd.CategoricalDtype):
+        return df["Driver"].cat.categories
+    values = pd.concat([df["Driver"], df["Incident involving"]]).dropna().unique()
+    return pd.Index(sorted(values))
+
+
+def encode_drivers(series, drivers):
+    if isinstance(series.dtype, pd.CategoricalDtype) and series.cat.categories.equals(drivers):
+        return series.cat.codes.to_numpy()
+    return drivers.get_indexer(series)
+
+
+def modal_teams(df):
+    # Modal team per driver from a driver x team count table; argmax picks the
+    # alphabetically first team on ties, as Series.mode() would.
+    driver_codes, drivers = pd.factorize(df["Driver"], sort=True)
+    team_codes, teams = pd.factorize(df["Team"], sort=True)
+    known = (driver_codes >= 0) & (team_codes >= 0)
+    counts = np.bincount(
+        driver_codes[known] * len(teams) + team_codes[known],
+        minlength=len(drivers) * len(teams),
+    ).reshape(len(drivers), len(teams))
+    has_team = counts.any(axis=1)
+    modal = counts.argmax(axis=1)
+    return {
+        driver: teams[modal[i]] if has_team[i] else None
+        for i, driver in enumerate(drivers)
+    }
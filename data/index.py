@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+from functools import cached_property
+
+
+class Membership:
+    # Ragged row -> values membership stored as CSR arrays: the values of row i
+    # are vocab[codes[offsets[i]:offsets[i + 1]]].
+
+    def __init__(self, vocab, codes, offsets):
+        self.vocab = list(vocab)
+        self.codes = np.asarray(codes, dtype=np.int32)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.lookup = {value: code for code, value in enumerate(self.vocab)}
+
+    @classmethod
+    def from_lists(cls, lists, vocab=None):
+        lists = [sorted(set(values)) for values in lists]
+        if vocab is None:
+            vocab = sorted({value for values in lists for value in values})
+        lookup = {value: code for code, value in enumerate(vocab)}
+
+        lengths = np.fromiter((len(values) for values in lists), dtype=np.int64, count=len(lists))
+        offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        codes = np.fromiter(
+            (lookup[value] for values in lists for value in values),
+            dtype=np.int32,
+            count=int(offsets[-1]),
+        )
+        return cls(vocab, codes, offsets)
+
+    @classmethod
+    def from_strings(cls, series, parser):
+        # Parse each distinct source string once and broadcast by code; a
+        # trailing empty row stands in for missing values.
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        distinct = cls.from_lists([parser(value) for value in uniques] + [[]])
+        codes = np.where(codes < 0, len(uniques), codes)
+        return distinct.take(codes)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def nnz(self):
+        return len(self.codes)
+
+    @cached_property
+    def matrix(self):
+        from scipy import sparse
+
+        data = np.ones(len(self.codes), dtype=np.int8)
+        return sparse.csr_matrix(
+            (data, self.codes, self.offsets),
+            shape=(len(self), len(self.vocab)),
+        )
+
+    @cached_property
+    def row_ids(self):
+        return np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.offsets))
+
+    def take(self, rows):
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = self.offsets[rows]
+        lengths = self.offsets[rows + 1] - starts
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1], dtype=np.int64)
+        return Membership(self.vocab, self.codes[positions], offsets)
+
+    def codes_for(self, values):
+        return np.array([self.lookup[v] for v in values if v in self.lookup], dtype=np.int32)
+
+    def contains_any(self, values):
+        wanted = np.zeros(len(self.vocab), dtype=bool)
+        wanted[self.codes_for(values)] = True
+        mask = np.zeros(len(self), dtype=bool)
+        mask[self.row_ids[wanted[self.codes]]] = True
+        return mask
+
+    def contains(self, value):
+        return self.contains_any([value])
+
+    def counts(self):
+        counts = np.bincount(self.codes, minlength=len(self.vocab))
+        return pd.Series(counts, index=self.vocab, name="Count")
+
+    def weighted_sums(self, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        return pd.Series(
+            np.bincount(self.codes, weights=weights[self.row_ids], minlength=len(self.vocab)),
+            index=self.vocab,
+        )
+
+    def present(self):
+        return [self.vocab[code] for code in np.unique(self.codes)]
+
+
+class BitmapIndex:
+    # One packed bitset per (filter key, value). A filter resolves by OR-ing
+    # the bitsets of the selected values within a key and AND-ing across keys.
+
+    def __init__(self, n_rows):
+        self.n_rows = n_rows
+        self.bitmaps = {}
+
+    @classmethod
+    def build(cls, df, columns, memberships):
+        index = cls(len(df))
+        for key, column in columns.items():
+            codes, uniques = pd.factorize(df[column], use_na_sentinel=True)
+            index.add(key, codes, np.arange(len(df), dtype=np.int64), list(uniques))
+        for key, membership in memberships.items():
+            index.add(key, membership.codes, membership.row_ids, membership.vocab)
+        return index
+
+    def add(self, key, codes, rows, values):
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+        bitmaps = {}
+        for code, value in enumerate(values):
+            bits = np.zeros(self.n_rows, dtype=bool)
+            bits[rows[order[bounds[code]:bounds[code + 1]]]] = True
+            bitmaps[value] = np.packbits(bits)
+        self.bitmaps[key] = bitmaps
+
+    @property
+    def nbytes(self):
+        return sum(bits.nbytes for bitmaps in self.bitmaps.values() for bits in bitmaps.values())
+
+    def resolve(self, filters):
+        selected = None
+        for key, bitmaps in self.bitmaps.items():
+            values = filters.get(key)
+            if not values:
+                continue
+            matched = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+            for value in values:
+                bits = bitmaps.get(value)
+                if bits is not None:
+                    np.bitwise_or(matched, bits, out=matched)
+            selected = matched if selected is None else np.bitwise_and(selected, matched, out=selected)
+
+        if selected is None:
+            return np.arange(self.n_rows, dtype=np.int64)
+        return np.flatnonzero(np.unpackbits(selected, count=self.n_rows))
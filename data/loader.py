@@ -1,9 +1,55 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pathlib import Path
-from functools import lru_cache
 
+from data.cache import CACHES, LRUCache, canonical_filters, frame_memo, frame_signature, register_frame
+from data.cube import PenaltyCube
+from data.graph import IncidentIndex
+from data.index import BitmapIndex, Membership
+from monitoring.metrics import timed_phase
+
+
+logger = logging.getLogger(__name__)
+
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+WORKBOOK_PATH = Path(__file__).parent / "F1Penalties.xlsx"
+DATA_PATH = Path(os.environ.get("F1_DATA_PATH", WORKBOOK_PATH))
+SNAPSHOT_DIR = Path(os.environ.get("F1_SNAPSHOT_DIR", Path(__file__).parent / ".snapshots"))
+SNAPSHOT_VERSION = 4
+SNAPSHOT_METADATA_KEY = b"f1_penalties_snapshot"
+DATASET_STORAGE = os.environ.get("F1_DATASET_STORAGE", "memory")
+MIXED_COLUMNS = ["Grid Penalty"]
+FILTER_CACHE_SIZE = int(os.environ.get("F1_FILTER_CACHE_SIZE", 256))
+FILTER_CACHE_BYTES = int(os.environ.get("F1_FILTER_CACHE_MB", 64)) * 1024 * 1024
+STARTUP_MODE = os.environ.get("F1_STARTUP_MODE", "lazy")
+
+FILTER_COLUMNS = {
+    "years": "Year",
+    "races": "Race",
+    "sessions": "Session",
+    "drivers": "Driver",
+    "teams": "Team",
+    "allegations": "Allegation",
+}
 
-DATA_PATH = Path(__file__).parent / "F1Penalties.xlsx"
+DIMENSION_COLUMNS = {
+    "Driver": ["Driver", "Incident involving"],
+    "Team": ["Team"],
+    "Race": ["Race"],
+    "Session": ["Session"],
+    "Allegation": ["Allegation"],
+    "Outcome": ["Outcome"],
+}
 
 DRIVER_NAME_MAP = {
     "Alexander Albon": "Alex Albon",
@@ -203,9 +249,283 @@ OUTCOME_CANONICAL = {
 SHEETS_TO_LOAD = ["2020", "2021", "2022", "2023", "2024", "2025"]
 
 
-@lru_cache(maxsize=1)
+class Dataset:
+    def __init__(self, df, version, memberships=None):
+        self.df = df
+        self.version = version
+        self.memberships = memberships or build_memberships(df)
+        self.bitmaps = BitmapIndex.build(df, FILTER_COLUMNS, self.memberships)
+        self._built = {}
+        self._build_locks = {name: threading.Lock() for name in ("cube", "incidents", "catalogs")}
+    
+    @property
+    def cube(self):
+        return self.built("cube", lambda: PenaltyCube.build(self.df, self.memberships["outcomes"], FILTER_COLUMNS))
+    
+    @property
+    def incidents(self):
+        return self.built("incidents", lambda: IncidentIndex.build(self.df))
+    
+    @property
+    def catalogs(self):
+        return self.built("catalogs", self.build_catalogs)
+    
+    def built(self, name, build):
+        # Build each lazy index once under its own lock: the lazy warm-up
+        # thread races the first requests for them, and cached_property no
+        # longer locks from Python 3.12.
+        value = self._built.get(name)
+        if value is None:
+            with self._build_locks[name]:
+                value = self._built.get(name)
+                if value is None:
+                    value = self._built[name] = build()
+        return value
+    
+    def build_catalogs(self):
+        # Dropdown options straight from the bitmap index, whose keys are
+        # exactly the values present per filter column.
+        catalogs = {
+            key: sorted(value for value in bitmaps if value)
+            for key, bitmaps in self.bitmaps.bitmaps.items()
+            if key in FILTER_COLUMNS
+        }
+        for key, membership in self.memberships.items():
+            catalogs[key] = membership.present()
+        return catalogs
+    
+    def warm(self):
+        self.cube
+        self.incidents
+        return self
+    
+    def contains_rows_of(self, df):
+        # Index labels are dataset positions only for frames of known lineage:
+        # the dataset itself, or one registered against this version by
+        # filter_data. Anything else may have been reordered or relabelled.
+        if df is self.df:
+            return True
+        signature = frame_signature(df)
+        if signature is None or signature[0] != self.version:
+            return False
+        index = df.index
+        if not pd.api.types.is_integer_dtype(index.dtype) or not index.is_unique:
+            return False
+        return len(index) == 0 or (index.min() >= 0 and index.max() < len(self.df))
+
+
+_dataset = None
+_dataset_lock = threading.Lock()
+
+
+@timed_phase("load")
+def load_dataset():
+    global _dataset
+    with _dataset_lock:
+        if _dataset is None:
+            key = snapshot_key()
+            if DATASET_STORAGE == "mmap":
+                df, memberships = _load_mapped(key)
+            else:
+                df, memberships = _load_frame(key), None
+            _dataset = Dataset(df, key, memberships)
+            register_frame(_dataset.df, (key, ()))
+            if STARTUP_MODE == "eager":
+                _dataset.warm()
+        return _dataset
+
+
+def use_dataset(df, version):
+    global _dataset
+    for cache in CACHES:
+        cache.clear()
+    with _dataset_lock:
+        _dataset = Dataset(df.reset_index(drop=True), version)
+        register_frame(_dataset.df, (version, ()))
+        return _dataset
+
+
 def load_data():
-    xlsx = pd.ExcelFile(DATA_PATH)
+    return load_dataset().df
+
+
+def get_membership(df, name):
+    dataset = load_dataset()
+    membership = dataset.memberships[name]
+    if df is dataset.df:
+        return membership
+    if dataset.contains_rows_of(df):
+        if df.index.equals(dataset.df.index):
+            return membership
+        return membership.take(df.index.to_numpy())
+    source, parser = MEMBERSHIP_SOURCES[name]
+    return Membership.from_strings(df[source], parser)
+
+
+@frame_memo("penalty_cube")
+def get_cube(df):
+    # Frames from filter_data slice the load-time cube; steward filters are not
+    # a cube dimension, so those re-aggregate their rows' cells instead.
+    dataset = load_dataset()
+    signature = frame_signature(df)
+    if signature is not None and signature[0] == dataset.version:
+        filters = dict(signature[1])
+        if "stewards" not in filters:
+            return dataset.cube.slice(filters)
+    if dataset.contains_rows_of(df):
+        return dataset.cube.for_rows(df)
+    return PenaltyCube.build(df, get_membership(df, "outcomes"))
+
+
+@frame_memo("incident_graph")
+def get_incidents(df):
+    dataset = load_dataset()
+    signature = frame_signature(df)
+    if signature is not None and signature[0] == dataset.version:
+        filters = dict(signature[1])
+        if set(filters) <= {"years"}:
+            return dataset.incidents.for_years(filters.get("years"))
+    return dataset.incidents.for_frame(df)
+
+
+def _load_frame(key):
+    path = SNAPSHOT_DIR / f"penalties-{key[:16]}.parquet"
+    
+    if path.exists():
+        start = time.perf_counter()
+        try:
+            df, metadata = read_snapshot(path, key)
+        except (OSError, ValueError, pa.ArrowException) as exc:
+            logger.warning("Discarding unreadable snapshot %s: %s", path.name, exc)
+        else:
+            elapsed = time.perf_counter() - start
+            logger.info(
+                "Loaded %d rows from snapshot %s in %.3fs (xlsx build took %.3fs)",
+                len(df), path.name, elapsed, metadata.get("build_seconds", float("nan")),
+            )
+            return df
+    
+    start = time.perf_counter()
+    df = load_source(DATA_PATH)
+    elapsed = time.perf_counter() - start
+    logger.info("Loaded %d rows from %s in %.3fs", len(df), DATA_PATH.name, elapsed)
+    
+    try:
+        write_snapshot(df, path, key, build_seconds=elapsed)
+    except OSError as exc:
+        logger.warning("Could not write snapshot %s: %s", path, exc)
+    return df
+
+
+def _load_mapped(key):
+    # The cleaned frame and the membership CSR arrays in one uncompressed Arrow
+    # IPC file, memory-mapped so every process attaches to the same page cache
+    # instead of holding a private copy.
+    path = SNAPSHOT_DIR / f"penalties-{key[:16]}.arrow"
+    
+    if path.exists():
+        try:
+            return read_mapped(path, key)
+        except (OSError, ValueError, KeyError, pa.ArrowException) as exc:
+            logger.warning("Discarding unreadable mapped dataset %s: %s", path.name, exc)
+    
+    df = _load_frame(key)
+    memberships = build_memberships(df)
+    try:
+        write_mapped(df, memberships, path, key)
+        return read_mapped(path, key)
+    except (OSError, pa.ArrowException) as exc:
+        logger.warning("Could not map dataset %s: %s", path, exc)
+        return df, memberships
+
+
+def write_mapped(df, memberships, path, key):
+    frame = df.copy()
+    for col in MIXED_COLUMNS:
+        if col in frame.columns:
+            frame[col] = frame[col].map(_encode_mixed)
+    
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    for name, membership in memberships.items():
+        column = pa.LargeListArray.from_arrays(
+            pa.array(membership.offsets, type=pa.int64()),
+            pa.array(membership.codes, type=pa.int32()),
+        )
+        table = table.append_column(f"__{name}", column)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SNAPSHOT_METADATA_KEY] = json.dumps({
+        "key": key,
+        "version": SNAPSHOT_VERSION,
+        "memberships": {name: membership.vocab for name, membership in memberships.items()},
+    }).encode("utf-8")
+    table = table.replace_schema_metadata(metadata).combine_chunks()
+    
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+    
+    for stale in path.parent.glob("penalties-*.arrow"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+
+
+def read_mapped(path, key):
+    start = time.perf_counter()
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    raw_metadata = (table.schema.metadata or {}).get(SNAPSHOT_METADATA_KEY)
+    if raw_metadata is None:
+        raise ValueError("missing snapshot metadata")
+    metadata = json.loads(raw_metadata)
+    if metadata.get("key") != key or metadata.get("version") != SNAPSHOT_VERSION:
+        raise ValueError("mapped dataset is stale")
+    
+    memberships = {}
+    for name, vocab in metadata["memberships"].items():
+        column = table.column(f"__{name}").chunk(0)
+        memberships[name] = Membership(vocab, column.values.to_numpy(), column.offsets.to_numpy())
+        table = table.drop_columns([f"__{name}"])
+    
+    df = table.to_pandas(split_blocks=True)
+    for col in MIXED_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].map(_decode_mixed).astype(object)
+    logger.info("Mapped %d rows from %s in %.3fs", len(df), path.name, time.perf_counter() - start)
+    return df, memberships
+
+
+def parse_grid_cell(value):
+    # CSV cells arrive as text; read numbers back the way openpyxl reports
+    # workbook cells, integral values as int, so both sources clean alike.
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    if not isinstance(value, str):
+        return value
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    return int(number) if number.is_integer() else number
+
+
+def load_source(path):
+    # Workbooks and CSV files hold raw rows that still need cleaning; a Parquet
+    # file is a cleaned frame in the snapshot encoding, as written by
+    # data.synthetic.
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        df = decode_snapshot(pq.read_table(path))
+        return encode_dimensions(df).reset_index(drop=True)
+    if suffix == ".csv":
+        raw = pd.read_csv(path, dtype={"Grid Penalty": object})
+        raw["Grid Penalty"] = map_unique(raw["Grid Penalty"], parse_grid_cell)
+        return encode_dimensions(clean_data(raw)).reset_index(drop=True)
+    return load_workbook(path)
+
+
+def load_workbook(path=WORKBOOK_PATH):
+    xlsx = pd.ExcelFile(path)
     frames = []
     
     for sheet_name in xlsx.sheet_names:
@@ -215,15 +535,116 @@ def load_data():
     
     combined = pd.concat(frames, ignore_index=True)
     combined = clean_data(combined)
-    return combined
+    combined = encode_dimensions(combined)
+    return combined.reset_index(drop=True)
+
+
+def encode_dimensions(df):
+    df = df.copy()
+    for columns in DIMENSION_COLUMNS.values():
+        present = [col for col in columns if col in df.columns]
+        if not present:
+            continue
+        values = pd.concat([df[col] for col in present], ignore_index=True).dropna().unique()
+        dtype = pd.CategoricalDtype(sorted(values))
+        for col in present:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def snapshot_key():
+    digest = hashlib.sha256()
+    with open(DATA_PATH, "rb") as source:
+        for block in iter(lambda: source.read(1 << 20), b""):
+            digest.update(block)
+    canonical = {
+        "version": SNAPSHOT_VERSION,
+        "sheets": SHEETS_TO_LOAD,
+        "drivers": DRIVER_NAME_MAP,
+        "teams": TEAM_NAME_MAP,
+        "invalid_drivers": INVALID_DRIVERS,
+        "stewards": STEWARD_NAME_MAP,
+        "allegations": ALLEGATION_CANONICAL,
+        "outcomes": OUTCOME_CANONICAL,
+    }
+    digest.update(json.dumps(canonical, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def snapshot_table(df, **metadata):
+    frame = df.copy()
+    for col in MIXED_COLUMNS:
+        if col in frame.columns:
+            frame[col] = frame[col].map(_encode_mixed)
+    
+    table = pa.Table.from_pandas(frame, preserve_index=True)
+    schema_metadata = dict(table.schema.metadata or {})
+    schema_metadata[SNAPSHOT_METADATA_KEY] = json.dumps({"version": SNAPSHOT_VERSION, **metadata}).encode("utf-8")
+    return table.replace_schema_metadata(schema_metadata)
+
+
+def decode_snapshot(table):
+    df = table.to_pandas()
+    for col in MIXED_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].map(_decode_mixed).astype(object)
+    return df
+
+
+def write_snapshot(df, path, key, build_seconds=None):
+    table = snapshot_table(df, key=key, build_seconds=build_seconds)
+    
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+    
+    for stale in path.parent.glob("penalties-*.parquet"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+
+
+def read_snapshot(path, key):
+    table = pq.read_table(path)
+    raw_metadata = (table.schema.metadata or {}).get(SNAPSHOT_METADATA_KEY)
+    if raw_metadata is None:
+        raise ValueError("missing snapshot metadata")
+    metadata = json.loads(raw_metadata)
+    if metadata.get("key") != key or metadata.get("version") != SNAPSHOT_VERSION:
+        raise ValueError("snapshot is stale")
+    
+    return decode_snapshot(table), metadata
+
+
+def _encode_mixed(value):
+    if pd.isna(value):
+        return None
+    kind = type(value).__name__
+    if kind not in ("int", "float"):
+        kind = "str"
+    return f"{kind}:{value}"
+
+
+def _decode_mixed(value):
+    if value is None or pd.isna(value):
+        return float("nan")
+    kind, _, text = value.partition(":")
+    if kind == "int":
+        return int(text)
+    if kind == "float":
+        return float(text)
+    return text
+
+
+STRIP_COLUMNS = ["Driver", "Team", "Race", "Session", "Allegation", "Outcome", "Incident involving"]
 
 
 def clean_data(df):
     df = df.copy()
     
-    for col in ["Driver", "Team", "Race", "Session", "Allegation", "Outcome", "Incident involving"]:
+    for col in STRIP_COLUMNS:
         if col in df.columns:
-            df[col] = df[col].apply(lambda x: str(x).strip() if pd.notna(x) else x)
+            df[col] = strip_strings(df[col])
     
     df["Year"] = pd.to_numeric(df["Year"], errors="coerce").astype("Int64")
     df["Round"] = pd.to_numeric(df["Round"], errors="coerce").astype("Int64")
@@ -237,37 +658,81 @@ def clean_data(df):
     df["Team"] = df["Team"].replace(TEAM_NAME_MAP)
     df["Incident involving"] = df["Incident involving"].replace(DRIVER_NAME_MAP)
     
-    df["Allegation"] = df["Allegation"].apply(standardize_allegation)
-    df["Outcome"] = df["Outcome"].apply(standardize_outcome_string)
+    df["Allegation"] = map_unique(df["Allegation"], standardize_allegation)
+    df["Outcome"] = map_unique(df["Outcome"], standardize_outcome_string)
     
     df = df[~df["Driver"].isin(INVALID_DRIVERS)]
     
     if "Stewards" not in df.columns:
         df["Stewards"] = None
     
-    df["Stewards_List"] = df["Stewards"].apply(parse_stewards)
-    df["Outcome_List"] = df["Outcome"].apply(parse_outcomes)
-    
     return df
 
 
+def pure_strings(series):
+    return series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) == "string"
+
+
+def strip_strings(series):
+    if isinstance(series.dtype, pd.StringDtype) or pure_strings(series):
+        return series.str.strip()
+    return map_unique(series, lambda x: str(x).strip() if pd.notna(x) else x)
+
+
+def map_unique(series, func):
+    # The dimension columns hold a few hundred distinct values at most, so
+    # mapping each unique value once and broadcasting back by code replaces
+    # a per-row Python call with a single take.
+    if series.dtype == object and not pure_strings(series):
+        # factorize treats 1, 1.0 and True as one key, which func may not, so
+        # mixed object columns are mapped value by value.
+        mapped = np.empty(len(series), dtype=object)
+        for i, value in enumerate(series.to_numpy()):
+            mapped[i] = func(value)
+        return pd.Series(mapped, index=series.index, name=series.name)
+    
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    mapped = np.empty(len(uniques) + 1, dtype=object)
+    for i, value in enumerate(uniques):
+        mapped[i] = func(value)
+    
+    missing = codes == -1
+    if missing.any():
+        mapped[-1] = func(series.to_numpy()[missing.argmax()])
+    
+    return pd.Series(mapped[codes], index=series.index, name=series.name)
+
+
 def apply_grid_penalty_from_outcome(df):
-    for idx, row in df.iterrows():
-        if pd.notna(row.get("Outcome")):
-            outcome_lower = str(row["Outcome"]).lower()
-            if "start from back of grid" in outcome_lower:
-                df.at[idx, "Grid Penalty"] = 19
-            elif "start from pit lane" in outcome_lower:
-                df.at[idx, "Grid Penalty"] = "Pit Lane"
-        
-        if pd.notna(row.get("Grid Penalty")):
-            gp = row["Grid Penalty"]
-            if isinstance(gp, str):
-                gp_lower = gp.lower()
-                if gp_lower == "pit lane":
-                    df.at[idx, "Grid Penalty"] = "Pit Lane"
-                elif gp_lower == "back of starting grid":
-                    df.at[idx, "Grid Penalty"] = 19
+    if "Outcome" in df.columns:
+        outcome = df["Outcome"]
+        outcome_lower = outcome.where(outcome.isna(), outcome.astype(str)).str.lower()
+        back_of_grid = outcome_lower.str.contains("start from back of grid", regex=False, na=False)
+        pit_lane = ~back_of_grid & outcome_lower.str.contains("start from pit lane", regex=False, na=False)
+    else:
+        back_of_grid = pit_lane = pd.Series(False, index=df.index)
+    
+    grid = df["Grid Penalty"] if "Grid Penalty" in df.columns else pd.Series(np.nan, index=df.index)
+    try:
+        grid_lower = grid.str.lower()
+    except AttributeError:
+        grid_pit_lane = grid_back_of_grid = pd.Series(False, index=df.index)
+    else:
+        grid_pit_lane = (grid_lower == "pit lane").fillna(False).astype(bool)
+        grid_back_of_grid = (grid_lower == "back of starting grid").fillna(False).astype(bool)
+    
+    set_back = ((back_of_grid | grid_back_of_grid) & ~grid_pit_lane).to_numpy()
+    set_pit = ((pit_lane | grid_pit_lane) & ~grid_back_of_grid).to_numpy()
+    if not set_back.any() and not set_pit.any():
+        return df
+    
+    if set_pit.any() or grid.dtype == object:
+        values = grid.to_numpy(dtype=object, copy=True)
+    else:
+        values = grid.to_numpy(copy=True)
+    values[set_back] = 19
+    values[set_pit] = "Pit Lane"
+    df["Grid Penalty"] = values
     return df
 
 
@@ -300,39 +765,92 @@ def parse_outcomes(outcome_str):
     return [OUTCOME_CANONICAL.get(p.lower(), p) for p in parts]
 
 
+MEMBERSHIP_SOURCES = {
+    "stewards": ("Stewards", parse_stewards),
+    "outcomes": ("Outcome", parse_outcomes),
+}
+
+
+def build_memberships(df):
+    return {
+        name: Membership.from_strings(df[source], parser)
+        for name, (source, parser) in MEMBERSHIP_SOURCES.items()
+    }
+
+
 def get_exploded_outcomes(df):
-    rows = []
-    for _, row in df.iterrows():
-        for outcome in row["Outcome_List"]:
-            new_row = row.copy()
-            new_row["Outcome_Single"] = outcome
-            rows.append(new_row)
-    if not rows:
+    membership = get_membership(df, "outcomes")
+    if membership.nnz == 0:
         return pd.DataFrame()
-    return pd.DataFrame(rows)
+    exploded = df.iloc[membership.row_ids]
+    return exploded.assign(Outcome_Single=np.array(membership.vocab, dtype=object)[membership.codes])
 
 
 def get_unique_values(df, column):
-    values = df[column].dropna().unique().tolist()
+    series = df[column]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        present = series.cat.remove_unused_categories().cat.categories
+        return [v for v in present.tolist() if v]
+    values = series.dropna().unique().tolist()
     return sorted([v for v in values if v])
 
 
 def get_unique_outcomes(df):
-    all_outcomes = set()
-    for outcome_list in df["Outcome_List"]:
-        all_outcomes.update(outcome_list)
-    return sorted(all_outcomes)
+    return get_membership(df, "outcomes").present()
 
 
 def get_unique_stewards(df):
-    all_stewards = set()
-    for steward_list in df["Stewards_List"]:
-        all_stewards.update(steward_list)
-    return sorted(all_stewards)
+    return get_membership(df, "stewards").present()
+
+
+def get_catalogs():
+    return load_dataset().catalogs
+
 
+filter_cache = LRUCache(
+    "filter_positions",
+    maxsize=FILTER_CACHE_SIZE,
+    max_bytes=FILTER_CACHE_BYTES,
+    weigher=lambda positions: positions.nbytes,
+)
 
+
+def filter_signature(filters):
+    return canonical_filters(filters, list(FILTER_COLUMNS) + list(MEMBERSHIP_SOURCES))
+
+
+@timed_phase("filter")
+def filter_positions(filters):
+    dataset = load_dataset()
+    signature = filter_signature(filters)
+    
+    def resolve():
+        positions = dataset.bitmaps.resolve(dict(signature))
+        if len(dataset.df) < np.iinfo(np.int32).max:
+            positions = positions.astype(np.int32)
+        positions.setflags(write=False)
+        return positions
+    
+    return filter_cache.get_or_compute((dataset.version, signature), resolve)
+
+
+@timed_phase("filter")
 def filter_data(df, filters):
-    filtered = df.copy()
+    # Copy-on-write keeps the returned frames from ever writing through to
+    # the shared dataset, so only the selected rows are materialized.
+    dataset = load_dataset()
+    if df is not dataset.df:
+        return filter_data_masks(df, filters)
+    signature = filter_signature(filters)
+    if not signature:
+        filtered = df.copy(deep=False)
+    else:
+        filtered = df.iloc[filter_positions(filters)]
+    return register_frame(filtered, (dataset.version, signature))
+
+
+def filter_data_masks(df, filters):
+    filtered = df.copy(deep=False)
     
     if filters.get("years"):
         filtered = filtered[filtered["Year"].isin(filters["years"])]
@@ -353,15 +871,11 @@ def filter_data(df, filters):
         filtered = filtered[filtered["Allegation"].isin(filters["allegations"])]
     
     if filters.get("outcomes"):
-        mask = filtered["Outcome_List"].apply(
-            lambda x: any(o in x for o in filters["outcomes"])
-        )
+        mask = get_membership(filtered, "outcomes").contains_any(filters["outcomes"])
         filtered = filtered[mask]
     
     if filters.get("stewards"):
-        mask = filtered["Stewards_List"].apply(
-            lambda x: any(s in x for s in filters["stewards"])
-        )
+        mask = get_membership(filtered, "stewards").contains_any(filters["stewards"])
         filtered = filtered[mask]
     
     return filtered
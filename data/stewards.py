@@ -0,0 +1,230 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data.cache import frame_memo
+from data.loader import get_membership
+
+
+MIN_PENALTIES = 10
+
+PERMUTATIONS = int(os.environ.get("F1_PERMUTATIONS", 10_000))
+PERMUTATION_WORKERS = int(os.environ.get("F1_PERMUTATION_WORKERS", 0))
+PERMUTATION_SEED = 2020
+PERMUTATION_POOL_THRESHOLD = 10_000
+PERMUTATION_BATCH_BYTES = 64 * 1024 * 1024
+# Shuffles times rows allowed per test; larger selections get fewer shuffles,
+# down to MIN_PERMUTATIONS, which still resolves p-values below 0.01.
+PERMUTATION_BUDGET = int(os.environ.get("F1_PERMUTATION_BUDGET", 20_000_000))
+MIN_PERMUTATIONS = 200
+
+BOOTSTRAP_RESAMPLES = 5000
+BOOTSTRAP_SEED = 2020
+BOOTSTRAP_CHUNK_BYTES = 32 * 1024 * 1024
+
+
+@frame_memo("steward_stats")
+def steward_stats(df, min_penalties=MIN_PENALTIES):
+    membership = get_membership(df, "stewards")
+    penalty_points = df["Penalty Points"].fillna(0).to_numpy(dtype=float)
+
+    counts = np.bincount(membership.codes, minlength=len(membership.vocab))
+    totals = np.bincount(
+        membership.codes,
+        weights=penalty_points[membership.row_ids],
+        minlength=len(membership.vocab),
+    )
+
+    keep = counts >= min_penalties
+    if not keep.any():
+        return pd.DataFrame()
+
+    return pd.DataFrame({
+        "Steward": np.array(membership.vocab, dtype=object)[keep],
+        "Count": counts[keep],
+        "Avg_PP": totals[keep] / counts[keep],
+        "Total_PP": totals[keep],
+    })
+
+
+class TeamBias:
+    # Steward x team contingency table for one filter state. overall holds
+    # each team's share of all penalties (largest first); deviation holds, per
+    # steward, the percentage difference of their team shares from overall;
+    # summary holds each steward's penalty count and chi-square goodness of fit
+    # against the overall distribution (NaN where the test is undefined).
+
+    def __init__(self, overall, deviation, summary):
+        self.overall = overall
+        self.deviation = deviation
+        self.summary = summary
+
+
+@frame_memo("steward_team_bias")
+def steward_team_bias(df):
+    from scipy import stats
+
+    membership = get_membership(df, "stewards")
+    team_codes, teams = pd.factorize(df["Team"], sort=True)
+    n_stewards, n_teams = len(membership.vocab), len(teams)
+
+    team_totals = np.bincount(team_codes[team_codes >= 0], minlength=n_teams)
+    order = np.argsort(-team_totals, kind="stable")
+    teams, team_totals = teams[order], team_totals[order]
+    rank = np.empty(n_teams, dtype=np.int64)
+    rank[order] = np.arange(n_teams)
+    team_codes = np.where(team_codes >= 0, rank[np.maximum(team_codes, 0)], -1)
+
+    entry_teams = team_codes[membership.row_ids]
+    known = entry_teams >= 0
+    contingency = np.bincount(
+        membership.codes[known].astype(np.int64) * n_teams + entry_teams[known],
+        minlength=n_stewards * n_teams,
+    ).reshape(n_stewards, n_teams)
+    penalties = np.bincount(membership.codes, minlength=n_stewards)
+
+    overall = team_totals / team_totals.sum() if team_totals.sum() else np.zeros(n_teams)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shares = contingency / contingency.sum(axis=1, keepdims=True)
+    shares = np.nan_to_num(shares)
+
+    observed = shares * penalties[:, None]
+    expected = overall[None, :] * penalties[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chi2 = ((observed - expected) ** 2 / expected).sum(axis=1)
+        relative_gap = np.abs(observed.sum(axis=1) - expected.sum(axis=1)) / np.minimum(
+            observed.sum(axis=1), expected.sum(axis=1)
+        )
+    # Same validity rules as scipy.stats.chisquare: at least two categories and
+    # observed/expected totals that agree to sqrt(eps).
+    valid = (n_teams >= 2) & (relative_gap <= np.sqrt(np.finfo(float).eps))
+    chi2 = np.where(valid, chi2, np.nan)
+    p_values = np.where(valid, stats.chi2.sf(chi2, max(n_teams - 1, 1)), np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deviation = (shares - overall[None, :]) / overall[None, :] * 100
+
+    stewards = pd.Index(membership.vocab, name="Steward")
+    team_index = pd.Index(np.asarray(teams, dtype=object), name="Team")
+    present = penalties > 0
+    return TeamBias(
+        overall=pd.Series(overall, index=team_index, name="Overall"),
+        deviation=pd.DataFrame(deviation, index=stewards, columns=team_index)[present],
+        summary=pd.DataFrame(
+            {"Penalties": penalties, "Chi2": chi2, "p_value": p_values},
+            index=stewards,
+        )[present],
+    )
+
+
+def permutation_batch(task):
+    # One block of permutations: shuffle penalty points across rows (each row
+    # keeps its steward panel) and count, per steward, how often the shuffled
+    # total deviates from expectation at least as much as the observed total.
+    from scipy import sparse
+
+    indices, indptr, shape, penalty_points, expected, threshold, seed, size = task
+    by_steward = sparse.csr_matrix((np.ones(len(indices)), indices, indptr), shape=shape)
+    rng = np.random.default_rng(seed)
+    shuffled = rng.permuted(np.broadcast_to(penalty_points, (size, len(penalty_points))), axis=1)
+    totals = by_steward @ shuffled.T
+    return (np.abs(totals - expected[:, None]) >= threshold[:, None]).sum(axis=1)
+
+
+def permutation_count(n_rows, permutations=PERMUTATIONS):
+    affordable = PERMUTATION_BUDGET // max(n_rows, 1)
+    return int(min(permutations, max(affordable, MIN_PERMUTATIONS)))
+
+
+@frame_memo("steward_permutations")
+def steward_permutation_test(df, permutations=PERMUTATIONS, seed=PERMUTATION_SEED):
+    membership = get_membership(df, "stewards")
+    penalty_points = df["Penalty Points"].fillna(0).to_numpy(dtype=float)
+    permutations = permutation_count(len(penalty_points), permutations)
+    overall = penalty_points.mean() if len(penalty_points) else 0.0
+
+    by_steward = membership.matrix.T.tocsr()
+    counts = np.bincount(membership.codes, minlength=len(membership.vocab))
+    observed = by_steward @ penalty_points
+    expected = counts * overall
+    deviation = np.abs(observed - expected)
+    threshold = deviation - 1e-9 * np.maximum(1.0, deviation)
+
+    # Batches have a fixed size and their own spawned seed, so results are the
+    # same whether they run in-process or across a pool.
+    batch = max(1, min(permutations, PERMUTATION_BATCH_BYTES // (8 * max(len(penalty_points), 1))))
+    sizes = [batch] * (permutations // batch)
+    if permutations % batch:
+        sizes.append(permutations % batch)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [
+        (by_steward.indices, by_steward.indptr, by_steward.shape, penalty_points, expected, threshold, child, size)
+        for child, size in zip(seeds, sizes)
+    ]
+
+    if PERMUTATION_WORKERS > 1 and permutations >= PERMUTATION_POOL_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=PERMUTATION_WORKERS) as pool:
+            exceedances = sum(pool.map(permutation_batch, tasks))
+    else:
+        exceedances = sum(map(permutation_batch, tasks))
+
+    present = counts > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        average = observed / counts
+    return pd.DataFrame(
+        {
+            "Count": counts,
+            "Avg_PP": average,
+            "Overall_Avg_PP": overall,
+            "p_value": (1 + exceedances) / (1 + permutations),
+            "Permutations": permutations,
+        },
+        index=pd.Index(membership.vocab, name="Steward"),
+    )[present]
+
+
+@frame_memo("steward_bootstrap")
+def steward_bootstrap_ci(df, resamples=BOOTSTRAP_RESAMPLES, confidence=0.95,
+                         min_penalties=MIN_PENALTIES, seed=BOOTSTRAP_SEED):
+    # Percentile bootstrap of each steward's mean penalty points. Penalty
+    # points take only a handful of distinct values, so resampling a steward's
+    # n penalties with replacement is a multinomial draw of n over that
+    # steward's value histogram; every steward and resample is drawn in one
+    # call, at a cost independent of the number of rows.
+    membership = get_membership(df, "stewards")
+    penalty_points = df["Penalty Points"].fillna(0).to_numpy(dtype=float)
+
+    counts = np.bincount(membership.codes, minlength=len(membership.vocab))
+    keep = np.flatnonzero(counts >= min_penalties)
+    if not len(keep):
+        return pd.DataFrame()
+
+    values, value_codes = np.unique(penalty_points, return_inverse=True)
+    slot = np.full(len(membership.vocab), -1, dtype=np.int64)
+    slot[keep] = np.arange(len(keep))
+    entry_slots = slot[membership.codes]
+    kept = entry_slots >= 0
+    histogram = np.bincount(
+        entry_slots[kept] * len(values) + value_codes[membership.row_ids[kept]],
+        minlength=len(keep) * len(values),
+    ).reshape(len(keep), len(values))
+    sizes = counts[keep]
+
+    rng = np.random.default_rng(seed)
+    means = np.empty((resamples, len(keep)))
+    chunk = max(1, BOOTSTRAP_CHUNK_BYTES // (8 * histogram.size))
+    for begin in range(0, resamples, chunk):
+        count = min(chunk, resamples - begin)
+        draws = rng.multinomial(sizes, histogram / sizes[:, None], size=(count, len(keep)))
+        means[begin:begin + count] = draws @ values / sizes
+
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(means, [alpha, 1 - alpha], axis=0)
+    return pd.DataFrame({
+        "Steward": np.array(membership.vocab, dtype=object)[keep],
+        "Avg_PP": histogram @ values / sizes,
+        "CI_Low": low,
+        "CI_High": high,
+    })
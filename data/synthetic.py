@@ -0,0 +1,261 @@
+import argparse
+import logging
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from data.loader import (
+    ALLEGATION_CANONICAL, OUTCOME_CANONICAL, SHEETS_TO_LOAD, STEWARD_NAME_MAP,
+    clean_data, encode_dimensions, load_workbook, parse_grid_cell, parse_outcomes, parse_stewards,
+    snapshot_table,
+)
+
+
+logger = logging.getLogger(__name__)
+
+RAW_COLUMNS = [
+    "Year", "Round", "Race", "Driver", "Team", "Session", "Allegation", "Allegation_Raw",
+    "Incident involving", "Outcome", "Time Penalty (in seconds)", "Fine", "Grid Penalty",
+    "Penalty Points", "Notes", "Stewards",
+]
+DONOR_COLUMNS = ["Time Penalty (in seconds)", "Fine", "Grid Penalty", "Penalty Points", "Notes"]
+OUTCOME_MEASURES = {
+    "Time Penalty": "Time Penalty (in seconds)",
+    "Fine": "Fine",
+    "Grid Penalty": "Grid Penalty",
+    "Penalty Points": "Penalty Points",
+}
+
+# Pseudo-counts added to every canonical value, so allegations, outcomes and
+# stewards that the workbook never pairs still turn up at large sizes.
+SMOOTHING = 0.5
+STEWARD_SMOOTHING = 0.05
+EXCEL_MAX_ROWS = 1_048_575
+
+
+def distribution(counts):
+    counts = np.asarray(counts, dtype=float)
+    return counts / counts.sum()
+
+
+def grouped(codes, n_groups):
+    # Row positions per code, without one boolean mask per group.
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(n_groups + 1))
+    for code in range(n_groups):
+        rows = order[bounds[code]:bounds[code + 1]]
+        if len(rows):
+            yield code, rows
+
+
+class PenaltyModel:
+    # Empirical distributions fitted to the cleaned workbook: the race
+    # calendar, per-season driver/team pairings, allegation frequencies,
+    # outcomes conditional on the allegation, penalty measures conditional on
+    # the outcome and per-season steward panels, smoothed over the canonical
+    # vocabularies in data/loader.py.
+
+    def __init__(self, df):
+        events = df.groupby(["Year", "Round", "Race"], observed=True).size()
+        self.events = events.index.to_frame(index=False)
+        self.event_p = distribution(events.to_numpy())
+
+        sessions = df["Session"].value_counts()
+        self.sessions = np.array(sessions.index.tolist(), dtype=object)
+        self.session_p = distribution(sessions.to_numpy())
+
+        self.pairings = {}
+        self.involved_rate = {}
+        for year, season in df.groupby("Year", observed=True):
+            pairs = season.groupby(["Driver", "Team"], observed=True).size()
+            self.pairings[year] = (
+                np.array(pairs.index.get_level_values(0).tolist(), dtype=object),
+                np.array(pairs.index.get_level_values(1).tolist(), dtype=object),
+                distribution(pairs.to_numpy()),
+            )
+            self.involved_rate[year] = season["Incident involving"].notna().mean()
+
+        observed_allegations = df["Allegation"].value_counts()
+        self.allegations = sorted(set(ALLEGATION_CANONICAL.values()) | set(observed_allegations.index))
+        allegation_counts = observed_allegations.reindex(self.allegations, fill_value=0).to_numpy()
+        self.allegation_p = distribution(allegation_counts + SMOOTHING)
+
+        observed_outcomes = df["Outcome"].value_counts()
+        self.outcomes = sorted(set(OUTCOME_CANONICAL.values()) | set(observed_outcomes.index))
+        overall = distribution(observed_outcomes.reindex(self.outcomes, fill_value=0).to_numpy() + SMOOTHING)
+        pairs = pd.crosstab(df["Allegation"].astype(object), df["Outcome"].astype(object))
+        pairs = pairs.reindex(index=self.allegations, columns=self.outcomes, fill_value=0).to_numpy()
+        self.outcome_p = pairs + SMOOTHING * overall
+        self.outcome_p /= self.outcome_p.sum(axis=1, keepdims=True)
+
+        self.raw_allegations = {}
+        for allegation, rows in df.groupby("Allegation", observed=True)["Allegation_Raw"]:
+            raw = rows.dropna().value_counts()
+            if len(raw):
+                self.raw_allegations[allegation] = (np.array(raw.index.tolist(), dtype=object), distribution(raw.to_numpy()))
+
+        self.donors = {
+            outcome: rows[DONOR_COLUMNS].to_numpy(dtype=object)
+            for outcome, rows in df.groupby("Outcome", observed=True)
+        }
+        self.measures = {
+            column: df[column].dropna().to_numpy(dtype=object)
+            for column in OUTCOME_MEASURES.values()
+        }
+
+        panels = df.drop_duplicates(["Year", "Round"])
+        panel_lists = [parse_stewards(value) for value in panels["Stewards"]]
+        sizes = pd.Series([len(panel) for panel in panel_lists if panel]).value_counts()
+        self.panel_sizes = sizes.index.to_numpy()
+        self.panel_size_p = distribution(sizes.to_numpy())
+        self.stewards = sorted(set(STEWARD_NAME_MAP.values()))
+        lookup = {name: code for code, name in enumerate(self.stewards)}
+        self.steward_p = {}
+        for year in self.pairings:
+            counts = np.full(len(self.stewards), STEWARD_SMOOTHING)
+            for panel_year, panel in zip(panels["Year"], panel_lists):
+                if panel_year == year:
+                    for name in panel:
+                        if name in lookup:
+                            counts[lookup[name]] += 1
+            self.steward_p[year] = distribution(counts)
+
+    @classmethod
+    def from_workbook(cls):
+        return cls(load_workbook())
+
+    def sample(self, n_rows, seed=0):
+        rng = np.random.default_rng(seed)
+
+        event = rng.choice(len(self.events), size=n_rows, p=self.event_p)
+        years = self.events["Year"].to_numpy()
+        frame = {
+            "Year": years[event].astype(np.int64),
+            "Round": self.events["Round"].to_numpy()[event].astype(np.int64),
+            "Race": np.array(self.events["Race"].tolist(), dtype=object)[event],
+            "Session": self.sessions[rng.choice(len(self.sessions), size=n_rows, p=self.session_p)],
+        }
+
+        # One steward panel per race weekend, as in the workbook.
+        panels = np.empty(len(self.events), dtype=object)
+        for i, year in enumerate(years):
+            size = min(rng.choice(self.panel_sizes, p=self.panel_size_p), len(self.stewards))
+            members = rng.choice(len(self.stewards), size=size, replace=False, p=self.steward_p[year])
+            panels[i] = ", ".join(self.stewards[code] for code in members)
+        frame["Stewards"] = panels[event]
+
+        drivers = np.empty(n_rows, dtype=object)
+        teams = np.empty(n_rows, dtype=object)
+        involved = np.full(n_rows, np.nan, dtype=object)
+        year_codes, year_values = pd.factorize(frame["Year"])
+        for code, rows in grouped(year_codes, len(year_values)):
+            pair_drivers, pair_teams, pair_p = self.pairings[year_values[code]]
+            picks = rng.choice(len(pair_p), size=len(rows), p=pair_p)
+            drivers[rows], teams[rows] = pair_drivers[picks], pair_teams[picks]
+            with_partner = rows[rng.random(len(rows)) < self.involved_rate[year_values[code]]]
+            partners = rng.choice(len(pair_p), size=len(with_partner), p=pair_p)
+            clash = pair_drivers[partners] == drivers[with_partner]
+            partners[clash] = (partners[clash] + 1) % len(pair_p)
+            involved[with_partner] = pair_drivers[partners]
+        frame["Driver"], frame["Team"], frame["Incident involving"] = drivers, teams, involved
+
+        allegation = rng.choice(len(self.allegations), size=n_rows, p=self.allegation_p)
+        allegations = np.array(self.allegations, dtype=object)
+        raw_allegations = allegations[allegation]
+        outcome = np.empty(n_rows, dtype=np.int64)
+        for code, rows in grouped(allegation, len(self.allegations)):
+            outcome[rows] = rng.choice(len(self.outcomes), size=len(rows), p=self.outcome_p[code])
+            raw = self.raw_allegations.get(self.allegations[code])
+            if raw is not None:
+                raw_allegations[rows] = raw[0][rng.choice(len(raw[1]), size=len(rows), p=raw[1])]
+        frame["Allegation"] = allegations[allegation]
+        frame["Allegation_Raw"] = raw_allegations
+        frame["Outcome"] = np.array(self.outcomes, dtype=object)[outcome]
+
+        # Measures come from a real row with the same outcome, so fines only
+        # appear with a Fine outcome; outcomes the workbook never recorded draw
+        # each implied measure independently.
+        donated = np.full((n_rows, len(DONOR_COLUMNS)), np.nan, dtype=object)
+        for code, rows in grouped(outcome, len(self.outcomes)):
+            donors = self.donors.get(self.outcomes[code])
+            if donors is not None:
+                donated[rows] = donors[rng.integers(len(donors), size=len(rows))]
+                continue
+            for part in parse_outcomes(self.outcomes[code]):
+                column = OUTCOME_MEASURES.get(part)
+                if column is not None and len(self.measures[column]):
+                    values = self.measures[column]
+                    donated[rows, DONOR_COLUMNS.index(column)] = values[rng.integers(len(values), size=len(rows))]
+        for i, column in enumerate(DONOR_COLUMNS):
+            frame[column] = donated[:, i]
+
+        df = pd.DataFrame({column: frame[column] for column in RAW_COLUMNS})
+        for column in ["Time Penalty (in seconds)", "Fine", "Penalty Points"]:
+            df[column] = pd.to_numeric(df[column])
+        # Donor rows may hold integral floats; store them as the int an Excel
+        # cell reads back as, so every output format loads the same values.
+        df["Grid Penalty"] = df["Grid Penalty"].astype(object).map(parse_grid_cell)
+        return df
+
+
+def generate(n_rows, seed=0, model=None):
+    return (model or PenaltyModel.from_workbook()).sample(n_rows, seed)
+
+
+def generate_dataset(n_rows, seed=0, model=None):
+    # Cleaned and encoded like load_workbook output, ready for use_dataset.
+    return encode_dimensions(clean_data(generate(n_rows, seed, model))).reset_index(drop=True)
+
+
+def write_xlsx(df, path):
+    seasons = {str(year): season for year, season in df.groupby("Year")}
+    oversized = [name for name, season in seasons.items() if len(season) > EXCEL_MAX_ROWS]
+    if oversized:
+        raise ValueError(
+            f"Seasons {', '.join(oversized)} exceed Excel's {EXCEL_MAX_ROWS:,} row limit; write CSV or Parquet instead"
+        )
+    with pd.ExcelWriter(path) as writer:
+        for name in SHEETS_TO_LOAD:
+            if name in seasons:
+                seasons[name].to_excel(writer, sheet_name=name, index=False)
+
+
+def write_csv(df, path):
+    df.to_csv(path, index=False)
+
+
+def write_parquet(df, path):
+    cleaned = encode_dimensions(clean_data(df)).reset_index(drop=True)
+    pq.write_table(snapshot_table(cleaned, source="synthetic", rows=len(cleaned)), path)
+
+
+WRITERS = {".xlsx": write_xlsx, ".csv": write_csv, ".parquet": write_parquet}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic penalty dataset shaped like the workbook.")
+    parser.add_argument("output", type=Path, help="Destination; .xlsx, .csv or .parquet picks the format.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    writer = WRITERS.get(args.output.suffix.lower())
+    if writer is None:
+        parser.error(f"unsupported format {args.output.suffix!r}; use one of {', '.join(WRITERS)}")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    start = time.perf_counter()
+    df = generate(args.rows, args.seed)
+    generated = time.perf_counter() - start
+    writer(df, args.output)
+    logger.info(
+        "Generated %d rows in %.2fs, wrote %s in %.2fs; load it with F1_DATA_PATH=%s",
+        len(df), generated, args.output, time.perf_counter() - start - generated, args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import numbers
+import operator
+import re
+
+import numpy as np
+import pandas as pd
+
+from data.cache import LRUCache
+from data.loader import filter_positions, filter_signature, load_dataset
+
+
+TABLE_COLUMNS = [
+    "Year", "Round", "Race", "Driver", "Team", "Session",
+    "Allegation", "Allegation_Raw", "Incident involving", "Outcome",
+    "Time Penalty (in seconds)", "Fine", "Grid Penalty", "Penalty Points",
+    "Notes", "Stewards",
+]
+PAGE_SIZE = 25
+
+RELATIONAL_OPERATORS = {
+    "=": operator.eq, "eq": operator.eq,
+    "!=": operator.ne, "ne": operator.ne,
+    "<": operator.lt, "lt": operator.lt,
+    "<=": operator.le, "le": operator.le,
+    ">": operator.gt, "gt": operator.gt,
+    ">=": operator.ge, "ge": operator.ge,
+    "contains": lambda left, right: right in left,
+    "datestartswith": lambda left, right: left.startswith(right),
+}
+
+FILTER_TERM = re.compile(r"^\{(?P<column>[^}]+)\}\s+(?P<operator>\S+)\s*(?P<value>.*)$")
+
+column_cache = LRUCache("table_columns", maxsize=64)
+view_cache = LRUCache(
+    "table_views",
+    maxsize=128,
+    max_bytes=32 * 1024 * 1024,
+    weigher=lambda positions: positions.nbytes,
+)
+
+
+def encode_column(dataset, column):
+    # Sorted dictionary encoding of a dataset column, computed once per
+    # dataset version: codes order rows for sorting, and filter predicates are
+    # evaluated once per distinct value instead of once per row.
+    def build():
+        codes, uniques = pd.factorize(dataset.df[column], use_na_sentinel=True)
+        uniques = np.asarray(uniques, dtype=object)
+        try:
+            order = np.argsort(uniques, kind="stable")
+        except TypeError:
+            order = np.array(sorted(range(len(uniques)), key=lambda i: mixed_sort_key(uniques[i])), dtype=np.int64)
+        ranks = np.empty(len(uniques), dtype=np.int32)
+        ranks[order] = np.arange(len(uniques), dtype=np.int32)
+        codes = np.where(codes < 0, -1, ranks[codes]).astype(np.int32)
+        return codes, uniques[order]
+
+    return column_cache.get_or_compute((dataset.version, column), build)
+
+
+def mixed_sort_key(value):
+    return (isinstance(value, str), str(value) if isinstance(value, str) else value)
+
+
+def is_number(value):
+    return isinstance(value, numbers.Number) and not isinstance(value, bool)
+
+
+def as_text(value):
+    if is_number(value) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def parse_value(text):
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "\"'`":
+        return text[1:-1].replace("\\" + text[0], text[0])
+    try:
+        number = float(text)
+    except ValueError:
+        return text
+    return int(number) if number.is_integer() else number
+
+
+def parse_filter_query(query):
+    terms = []
+    for part in (query or "").split(" && "):
+        match = FILTER_TERM.match(part.strip())
+        if match:
+            terms.append((match["column"], match["operator"], match["value"]))
+    return terms
+
+
+def predicate(op, value):
+    if op == "is":
+        kind = value.strip()
+        if kind in ("blank", "nil"):
+            return lambda left: left is None or (not isinstance(left, str) and pd.isna(left)) or left == ""
+        if kind == "num":
+            return is_number
+        if kind == "str":
+            return lambda left: isinstance(left, str)
+        return None
+
+    case_insensitive = False
+    if op not in RELATIONAL_OPERATORS and op[:1] in ("i", "s") and op[1:] in RELATIONAL_OPERATORS:
+        case_insensitive = op[0] == "i"
+        op = op[1:]
+    compare = RELATIONAL_OPERATORS.get(op)
+    if compare is None:
+        return None
+
+    right = parse_value(value)
+    text_only = op in ("contains", "datestartswith")
+
+    def evaluate(left):
+        if left is None or (not isinstance(left, str) and pd.isna(left)):
+            return False
+        if not text_only and is_number(left) and is_number(right):
+            return compare(left, right)
+        left_text, right_text = as_text(left), as_text(right)
+        if case_insensitive:
+            left_text, right_text = left_text.lower(), right_text.lower()
+        return compare(left_text, right_text)
+
+    return evaluate
+
+
+def build_view(dataset, filters, filter_query, sort_by):
+    positions = filter_positions(filters)
+
+    for column, op, value in parse_filter_query(filter_query):
+        test = predicate(op, value)
+        if test is None or column not in dataset.df.columns:
+            continue
+        codes, uniques = encode_column(dataset, column)
+        # The trailing slot answers for missing values, which carry code -1.
+        hits = np.fromiter(
+            (bool(test(unique)) for unique in uniques),
+            dtype=bool,
+            count=len(uniques),
+        )
+        hits = np.append(hits, bool(test(None)))
+        positions = positions[hits[codes[positions]]]
+
+    if sort_by:
+        keys = []
+        for column, direction in reversed(sort_by):
+            if column not in dataset.df.columns:
+                continue
+            codes, uniques = encode_column(dataset, column)
+            selected = codes[positions]
+            ranks = selected if direction == "asc" else len(uniques) - 1 - selected
+            keys.append(np.where(selected < 0, len(uniques), ranks))
+        if keys:
+            positions = positions[np.lexsort(keys)]
+
+    positions = np.array(positions, dtype=np.int32)
+    positions.setflags(write=False)
+    return positions
+
+
+def table_view(filters, filter_query="", sort_by=None):
+    dataset = load_dataset()
+    sort_key = tuple((item["column_id"], item["direction"]) for item in sort_by or [])
+    key = (dataset.version, filter_signature(filters), filter_query or "", sort_key)
+    return view_cache.get_or_compute(key, lambda: build_view(dataset, filters, filter_query, sort_key))
+
+
+def table_page(filters, filter_query="", sort_by=None, page_current=0, page_size=PAGE_SIZE):
+    dataset = load_dataset()
+    positions = table_view(filters, filter_query, sort_by)
+    start = (page_current or 0) * page_size
+    columns = [col for col in TABLE_COLUMNS if col in dataset.df.columns]
+    page = dataset.df.iloc[positions[start:start + page_size]][columns]
+    return page.to_dict("records"), len(positions)
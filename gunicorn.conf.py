@@ -0,0 +1,25 @@
+import gc
+import logging
+import os
+
+
+# Import the app once in the master so the dataset, its indexes and the
+# aggregate cube are built before forking; workers share those pages
+# copy-on-write instead of each loading their own copy.
+preload_app = os.environ.get("F1_PRELOAD", "1") != "0"
+
+# Build everything up front in the master: a lazy warm-up thread would not
+# survive the fork, and each worker would redo the work.
+os.environ.setdefault("F1_STARTUP_MODE", "eager" if preload_app else "lazy")
+
+# The app only logs through its module loggers; show their startup and
+# warm-up timings next to gunicorn's own output.
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+
+def when_ready(server):
+    # Move everything allocated during preload into the permanent generation
+    # so the workers' collectors never write to (and thereby copy) those pages.
+    if preload_app:
+        gc.collect()
+        gc.freeze()
@@ -1,6 +1,8 @@
 import dash_bootstrap_components as dbc
 from dash import html, dcc, dash_table
 
+from data.table import TABLE_COLUMNS, PAGE_SIZE
+
 
 def create_layout():
     return dbc.Container([
@@ -13,36 +15,45 @@ def create_layout():
         dbc.Row([
             dbc.Col([
                 html.P(id="data-count", className="text-muted mb-3"),
-            ], xs=12),
+            ], xs=12, md=6),
+            dbc.Col([
+                dbc.ButtonGroup([
+                    dbc.Button(
+                        [html.I(className="fas fa-download me-2"), label],
+                        id=f"export-{fmt}",
+                        href=f"/export/{fmt}",
+                        external_link=True,
+                        color="outline-secondary",
+                        size="sm",
+                    )
+                    for fmt, label in [("csv", "CSV"), ("parquet", "Parquet"), ("ndjson", "NDJSON")]
+                ], className="mb-3"),
+            ], xs=12, md=6, className="text-md-end"),
         ]),
         
         dbc.Row([
             dbc.Col([
-                html.Div(id="data-table-container"),
+                html.Div(create_data_table(), id="data-table-container"),
             ], xs=12),
         ]),
     ], fluid=True, className="py-3")
 
 
-def create_data_table(df):
-    display_columns = [
-        "Year", "Round", "Race", "Driver", "Team", "Session",
-        "Allegation", "Allegation_Raw", "Incident involving", "Outcome",
-        "Time Penalty (in seconds)", "Fine", "Grid Penalty", "Penalty Points", 
-        "Notes", "Stewards"
-    ]
-    
-    columns = [col for col in display_columns if col in df.columns]
-    
+def create_data_table():
+    # Paging, sorting and filter_query are resolved server-side by
+    # update_data_table, so only the visible page is ever sent to the client.
     return dash_table.DataTable(
         id="data-table",
-        columns=[{"name": col, "id": col} for col in columns],
-        data=df[columns].to_dict("records"),
-        page_size=25,
-        page_action="native",
-        sort_action="native",
+        columns=[{"name": col, "id": col} for col in TABLE_COLUMNS],
+        data=[],
+        page_current=0,
+        page_size=PAGE_SIZE,
+        page_action="custom",
+        sort_action="custom",
         sort_mode="multi",
-        filter_action="native",
+        sort_by=[],
+        filter_action="custom",
+        filter_query="",
         style_table={"overflowX": "auto"},
         style_cell={
             "textAlign": "left",
@@ -23,6 +23,18 @@ def create_layout(stewards):
             ], xs=12, lg=6, className="mb-4"),
         ]),
         
+        dbc.Row([
+            dbc.Col([
+                html.H5("Team Distribution by Steward", className="mb-2"),
+                html.P(
+                    "Chi-square test of each steward's penalties by team against the overall distribution "
+                    "(stewards with at least 10 penalties).",
+                    className="text-muted small mb-3"
+                ),
+                html.Div(id="steward-bias-table"),
+            ], xs=12, className="mb-4"),
+        ]),
+        
         dbc.Row([
             dbc.Col([
                 html.H5("Steward Detail", className="mt-4 mb-3"),
@@ -0,0 +1,174 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import g, has_request_context
+
+from monitoring.profiling import ARMED, CALLBACKS, claim, profile_call
+
+
+METRICS = []
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = tuple(2 ** power for power in range(10, 25, 2))
+
+_local = threading.local()
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) + (math.inf,)
+        self._series = {}
+        self._lock = threading.Lock()
+        METRICS.append(self)
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def totals(self, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            return (series[1], series[2]) if series else (0.0, 0)
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def collect(self):
+        with self._lock:
+            snapshot = [(key, list(counts), total, count) for key, (counts, total, count) in self._series.items()]
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, counts, total, count in sorted(snapshot):
+            labels = [f'{name}="{escape(value)}"' for name, value in zip(self.labelnames, key)]
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = "+Inf" if math.isinf(bound) else repr(float(bound))
+                bucket_labels = ",".join(labels + [f'le="{le}"'])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {cumulative}")
+            suffix = "{" + ",".join(labels) + "}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {total!r}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+        return lines
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+
+callback_seconds = Histogram(
+    "f1_callback_duration_seconds", "Wall time of Dash callback handlers.", ["callback"], LATENCY_BUCKETS,
+)
+callback_phase_seconds = Histogram(
+    "f1_callback_phase_seconds", "Wall time per callback spent loading, filtering, building figures and elsewhere.",
+    ["callback", "phase"], LATENCY_BUCKETS,
+)
+callback_response_bytes = Histogram(
+    "f1_callback_response_bytes", "Serialized size of Dash callback responses.", ["callback"], BYTES_BUCKETS,
+)
+chart_seconds = Histogram(
+    "f1_chart_duration_seconds", "Wall time of chart builders, including figure cache hits.", ["chart"], LATENCY_BUCKETS,
+)
+
+
+@contextmanager
+def phase(name):
+    # Attributes time to a phase of the enclosing callback. Only the outermost
+    # phase counts, so a chart that loads data is timed as figure work once.
+    phases = getattr(_local, "phases", None)
+    if phases is None or getattr(_local, "phase", None) is not None:
+        yield
+        return
+    _local.phase = name
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _local.phase = None
+        phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+
+
+def timed_phase(name):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def observe_callback(func):
+    name = func.__name__
+    CALLBACKS.add(name)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        outer, _local.phases = getattr(_local, "phases", None), {}
+        start = time.perf_counter()
+        try:
+            if ARMED and claim(name):
+                return profile_call(name, func, args, kwargs)
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            phases, _local.phases = _local.phases, outer
+            callback_seconds.observe(elapsed, callback=name)
+            for phase_name, seconds in phases.items():
+                callback_phase_seconds.observe(seconds, callback=name, phase=phase_name)
+            callback_phase_seconds.observe(max(elapsed - sum(phases.values()), 0.0), callback=name, phase="other")
+            if has_request_context():
+                g.f1_callback = name
+
+    return wrapper
+
+
+def observed(register):
+    # Wraps a Dash callback decorator (dash.callback or app.callback) so every
+    # handler it registers is timed.
+    def callback(*args, **kwargs):
+        decorator = register(*args, **kwargs)
+        return lambda func: decorator(observe_callback(func))
+
+    return callback
+
+
+def observe_chart(func):
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            with phase("figure"):
+                return func(*args, **kwargs)
+        finally:
+            chart_seconds.observe(time.perf_counter() - start, chart=name)
+
+    return wrapper
@@ -0,0 +1,131 @@
+import cProfile
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = Path(os.environ.get("F1_PROFILE_DIR", Path(tempfile.gettempdir()) / "f1-profiles"))
+SAMPLE_INTERVAL = float(os.environ.get("F1_PROFILE_INTERVAL_MS", 1)) / 1000
+
+# Callback name -> invocations still to profile. Empty unless profiling has
+# been requested, so the per-call check in observe_callback is a falsy test.
+ARMED = {}
+
+# Names of every callback observe_callback has wrapped, i.e. the ones a
+# profile can be armed for.
+CALLBACKS = set()
+
+_lock = threading.Lock()
+_sequence = 0
+
+
+def parse_requests(spec):
+    requests = {}
+    for item in (spec or "").split(","):
+        name, _, count = item.strip().partition(":")
+        if not name:
+            continue
+        try:
+            count = int(count or 1)
+        except ValueError:
+            logger.warning("Ignoring F1_PROFILE entry %r: count must be an integer", item.strip())
+            continue
+        if count > 0:
+            requests[name] = count
+    return requests
+
+
+def arm(name, count=1):
+    with _lock:
+        if count > 0:
+            ARMED[name] = count
+        else:
+            ARMED.pop(name, None)
+        return dict(ARMED)
+
+
+def claim(name):
+    with _lock:
+        remaining = ARMED.get(name, 0)
+        if remaining <= 0:
+            return False
+        if remaining == 1:
+            del ARMED[name]
+        else:
+            ARMED[name] = remaining - 1
+        return True
+
+
+class StackSampler(threading.Thread):
+    # Samples one thread's Python stack at a fixed interval and counts each
+    # distinct stack, which is what flame graph tools consume.
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def profile_call(name, func, args, kwargs):
+    global _sequence
+    with _lock:
+        _sequence += 1
+        sequence = _sequence
+
+    sampler = StackSampler(threading.get_ident())
+    profiler = cProfile.Profile()
+    sampler.start()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+        sampler.stop()
+        stem = f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{sequence}"
+        try:
+            PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(PROFILE_DIR / f"{stem}.pstats")
+            (PROFILE_DIR / f"{stem}.collapsed").write_text(sampler.collapsed())
+        except OSError as exc:
+            logger.warning("Could not write profile %s: %s", stem, exc)
+        else:
+            logger.info("Profiled %s in %.3fs -> %s", name, elapsed, PROFILE_DIR / stem)
+
+
+def list_profiles():
+    if not PROFILE_DIR.exists():
+        return []
+    paths = sorted(PROFILE_DIR.glob("*.pstats"), key=lambda path: path.stat().st_mtime, reverse=True)
+    return [path.stem for path in paths]
+
+
+ARMED.update(parse_requests(os.environ.get("F1_PROFILE")))
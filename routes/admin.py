@@ -0,0 +1,45 @@
+import hmac
+import os
+
+from flask import abort, jsonify, request, send_from_directory
+
+from monitoring.profiling import ARMED, CALLBACKS, PROFILE_DIR, arm, list_profiles
+
+
+ADMIN_TOKEN = os.environ.get("F1_ADMIN_TOKEN")
+
+
+def authorized():
+    supplied = request.headers.get("X-Admin-Token") or request.args.get("token") or ""
+    return hmac.compare_digest(supplied.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+
+
+def register_admin_routes(server):
+    # Without a token the admin surface does not exist at all.
+    if not ADMIN_TOKEN:
+        return
+
+    @server.route("/admin/profile", methods=["GET", "POST"])
+    def profile():
+        if not authorized():
+            abort(403)
+        name = request.args.get("callback")
+        if name:
+            if name not in CALLBACKS:
+                abort(400, description=f"unknown callback {name!r}")
+            try:
+                count = int(request.args.get("count", 1))
+            except ValueError:
+                abort(400, description="count must be an integer")
+            armed = arm(name, count)
+        else:
+            armed = dict(ARMED)
+        return jsonify({"armed": armed, "profiles": list_profiles()})
+
+    @server.route("/admin/profile/<stem>.<kind>")
+    def download_profile(stem, kind):
+        if not authorized():
+            abort(403)
+        if kind not in ("pstats", "collapsed"):
+            abort(404)
+        return send_from_directory(PROFILE_DIR, f"{stem}.{kind}", as_attachment=True)
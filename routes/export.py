@@ -0,0 +1,160 @@
+import io
+import json
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from flask import Response, abort, request
+
+from data.cache import LRUCache
+from data.loader import FILTER_COLUMNS, MEMBERSHIP_SOURCES, MIXED_COLUMNS, filter_positions, load_dataset
+from data.table import TABLE_COLUMNS
+
+
+EXPORT_CHUNK_ROWS = 10_000
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+FILTER_KEYS = list(FILTER_COLUMNS) + list(MEMBERSHIP_SOURCES)
+
+schema_cache = LRUCache("export_schema", maxsize=8)
+
+
+class ChunkSink(io.RawIOBase):
+    # Write-only file handed to ParquetWriter; drain() hands back whatever has
+    # been written since the last call so row groups stream out as they close.
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def parse_export_filters(args):
+    # Accepts the filter-store JSON as ?filters=... or one repeated query
+    # parameter per filter key, e.g. ?years=2023&drivers=Max%20Verstappen.
+    if "filters" in args:
+        try:
+            filters = json.loads(args["filters"])
+        except ValueError:
+            abort(400, description="filters must be the filter-store JSON object")
+        if not isinstance(filters, dict):
+            abort(400, description="filters must be the filter-store JSON object")
+        for key in FILTER_KEYS:
+            values = filters.get(key)
+            if values is not None and (
+                not isinstance(values, list)
+                or not all(isinstance(value, (str, int, float)) for value in values)
+            ):
+                abort(400, description=f"filters.{key} must be a list of values")
+        return filters
+
+    filters = {}
+    for key in FILTER_KEYS:
+        values = args.getlist(key)
+        if key == "years":
+            try:
+                values = [int(value) for value in values]
+            except ValueError:
+                abort(400, description="years must be integers")
+        if values:
+            filters[key] = values
+    return filters
+
+
+def iter_chunks(df, positions, columns):
+    for start in range(0, len(positions), EXPORT_CHUNK_ROWS):
+        yield df.iloc[positions[start:start + EXPORT_CHUNK_ROWS]][columns]
+
+
+def stream_csv(chunks, columns):
+    header = True
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=header)
+        header = False
+    if header:
+        yield pd.DataFrame(columns=columns).to_csv(index=False)
+
+
+def stream_ndjson(chunks):
+    for chunk in chunks:
+        if len(chunk):
+            yield chunk.to_json(orient="records", lines=True, date_format="iso").rstrip("\n") + "\n"
+
+
+def parquet_frame(df):
+    for column in MIXED_COLUMNS:
+        if column in df.columns:
+            df = df.assign(**{column: df[column].map(str, na_action="ignore")})
+    return df
+
+
+def frame_schema(df):
+    # Typed from the whole frame: a column that is all null in the first chunk
+    # would otherwise be typed null and later chunks would fail to convert.
+    return pa.Schema.from_pandas(parquet_frame(df), preserve_index=False)
+
+
+def export_schema(dataset, columns):
+    return schema_cache.get_or_compute(
+        (dataset.version, tuple(columns)),
+        lambda: frame_schema(dataset.df[columns]),
+    )
+
+
+def stream_parquet(chunks, schema):
+    sink = ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    for chunk in chunks:
+        writer.write_table(pa.Table.from_pandas(parquet_frame(chunk), schema=schema, preserve_index=False))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def register_export_routes(server):
+    @server.route("/export/<fmt>")
+    def export(fmt):
+        if fmt not in EXPORT_FORMATS:
+            abort(404, description=f"Unknown export format {fmt!r}; use one of {', '.join(EXPORT_FORMATS)}")
+
+        filters = parse_export_filters(request.args)
+        dataset = load_dataset()
+        positions = filter_positions(filters)
+        columns = [col for col in TABLE_COLUMNS if col in dataset.df.columns]
+        chunks = iter_chunks(dataset.df, positions, columns)
+
+        if fmt == "csv":
+            body = stream_csv(chunks, columns)
+        elif fmt == "ndjson":
+            body = stream_ndjson(chunks)
+        else:
+            body = stream_parquet(chunks, export_schema(dataset, columns))
+
+        return Response(
+            body,
+            mimetype=EXPORT_FORMATS[fmt],
+            headers={
+                "Content-Disposition": f"attachment; filename=f1-penalties.{fmt}",
+                "X-Row-Count": str(len(positions)),
+            },
+        )
@@ -0,0 +1,16 @@
+from flask import Response, g
+
+from monitoring.metrics import callback_response_bytes, render
+
+
+def register_metrics_routes(server):
+    @server.after_request
+    def record_callback_bytes(response):
+        name = g.pop("f1_callback", None)
+        if name is not None and not response.is_streamed:
+            callback_response_bytes.observe(response.content_length or 0, callback=name)
+        return response
+
+    @server.route("/metrics")
+    def metrics():
+        return Response(render(), mimetype="text/plain; version=0.0.4")
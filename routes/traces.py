@@ -0,0 +1,53 @@
+import hashlib
+import json
+import os
+import secrets
+import threading
+import time
+
+from flask import request
+
+
+TRACE_PATH = os.environ.get("F1_TRACE_PATH")
+
+# Sessions are keyed by a salted hash of client address and user agent, so the
+# trace never holds either. The salt is drawn at import; with preload every
+# worker inherits the master's, so one browser maps to one session everywhere.
+_salt = secrets.token_bytes(16)
+_lock = threading.Lock()
+_file = None
+_file_pid = None
+
+
+def session_key():
+    address = request.headers.get("X-Forwarded-For", request.remote_addr or "").split(",")[0].strip()
+    agent = request.headers.get("User-Agent", "")
+    return hashlib.sha256(_salt + f"{address}|{agent}".encode("utf-8")).hexdigest()[:16]
+
+
+def append(line):
+    global _file, _file_pid
+    with _lock:
+        # Open per process: a handle inherited across the gunicorn fork would
+        # share its buffer with the master.
+        if _file is None or _file_pid != os.getpid():
+            _file = open(TRACE_PATH, "a", encoding="utf-8")
+            _file_pid = os.getpid()
+        _file.write(line)
+        _file.flush()
+
+
+def register_trace_recording(server):
+    # Appends every Dash callback request to F1_TRACE_PATH as NDJSON, for
+    # benchmarks/bench_load.py to replay. Nothing is registered without it.
+    if not TRACE_PATH:
+        return
+
+    @server.before_request
+    def record_callback_request():
+        if request.method != "POST" or request.path != "/_dash-update-component":
+            return None
+        body = request.get_json(silent=True)
+        if body is not None:
+            append(json.dumps({"ts": time.time(), "session": session_key(), "body": body}) + "\n")
+        return None
@@ -0,0 +1,29 @@
+import plotly.io as pio
+
+from components import charts
+from data.loader import load_data
+
+
+def test_cached_figures_are_copies():
+    df = load_data()
+    first = charts.top_drivers(df)
+    first["layout"]["title"] = "changed"
+    first["data"].clear()
+    second = charts.top_drivers(df)
+    assert second["layout"].get("title") != "changed"
+    assert second["data"]
+    assert second is not charts.top_drivers(df)
+
+
+def test_figure_weight_skips_serialization(monkeypatch):
+    df = load_data()
+    figure = charts.top_drivers(df)
+    weight = charts.figure_bytes(figure)
+    assert weight > 0.5 * len(pio.to_json(figure, validate=False))
+
+    def serialize(*args, **kwargs):
+        raise AssertionError("figure serialized to weigh it")
+
+    monkeypatch.setattr(pio, "to_json", serialize)
+    charts.top_drivers.cache.clear()
+    assert charts.top_drivers(df)["data"]
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_clean import legacy_clean_data
+from benchmarks.common import load_raw_frame, scale_frame
+from data.loader import clean_data, map_unique, strip_strings
+
+
+@pytest.fixture(scope="module")
+def raw():
+    return load_raw_frame()
+
+
+def assert_cleaned_like_legacy(raw):
+    expected = legacy_clean_data(raw)
+    actual = clean_data(raw)
+    pd.testing.assert_frame_equal(actual, expected.drop(columns=["Stewards_List", "Outcome_List"]))
+    pd.testing.assert_series_equal(actual["Grid Penalty"].map(type), expected["Grid Penalty"].map(type))
+
+
+def test_clean_data_matches_legacy_on_workbook(raw):
+    assert_cleaned_like_legacy(raw)
+
+
+def test_clean_data_matches_legacy_on_resampled_rows(raw):
+    assert_cleaned_like_legacy(scale_frame(raw, 10_000, seed=1))
+
+
+def legacy_strip(series):
+    # The row-wise strip legacy_clean_data applies to STRIP_COLUMNS.
+    return series.apply(lambda x: str(x).strip() if pd.notna(x) else x)
+
+
+@pytest.mark.parametrize("values", [
+    [" Max Verstappen", "Lewis Hamilton ", None, np.nan, "Max Verstappen"],
+    [1, 1.0, True, " 1 ", None, np.nan, "True"],
+    [None, np.nan],
+])
+def test_strip_strings_matches_per_cell(values):
+    series = pd.Series(values, dtype=object)
+    actual, expected = strip_strings(series), legacy_strip(series)
+    # Missing cells may come back as None or NaN depending on the inferred dtype.
+    assert actual.isna().tolist() == expected.isna().tolist()
+    assert actual.dropna().tolist() == expected.dropna().tolist()
+
+
+def test_map_unique_keeps_equal_hashing_values_apart():
+    series = pd.Series([1, 1.0, True, "1", None], dtype=object)
+    assert map_unique(series, repr).tolist() == ["1", "1.0", "True", "'1'", "None"]
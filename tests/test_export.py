@@ -0,0 +1,47 @@
+import io
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from flask import Flask
+
+from routes.export import frame_schema, register_export_routes, stream_parquet
+
+
+@pytest.fixture(scope="module")
+def client():
+    server = Flask(__name__)
+    register_export_routes(server)
+    return server.test_client()
+
+
+def test_parquet_column_null_only_in_first_chunk():
+    df = pd.DataFrame({
+        "Notes": pd.Series([None, None, "Warning issued", None, "Lap 12"], dtype=object),
+        "Penalty Points": [0.0, 1.0, 2.0, None, 3.0],
+        "Grid Penalty": pd.Series([None, 3, "Pit Lane", 19, None], dtype=object),
+    })
+    chunks = [df.iloc[:2], df.iloc[2:]]
+    body = b"".join(stream_parquet(iter(chunks), frame_schema(df)))
+
+    result = pq.read_table(io.BytesIO(body))
+    assert result.column("Notes").to_pylist() == [None, None, "Warning issued", None, "Lap 12"]
+    assert result.column("Grid Penalty").to_pylist() == [None, "3", "Pit Lane", "19", None]
+
+
+def test_parquet_export_matches_row_count(client):
+    response = client.get("/export/parquet?years=2023")
+    assert response.status_code == 200
+    table = pq.read_table(io.BytesIO(response.data))
+    assert table.num_rows == int(response.headers["X-Row-Count"])
+
+
+def test_parquet_export_empty_selection(client):
+    response = client.get("/export/parquet?drivers=Nobody")
+    assert response.status_code == 200
+    assert pq.read_table(io.BytesIO(response.data)).num_rows == 0
+
+
+@pytest.mark.parametrize("filters", ['{"years": 2023}', '{"years": "2023"}', '{"drivers": [["x"]]}', "[1]"])
+def test_malformed_filters_rejected(client, filters):
+    assert client.get("/export/csv", query_string={"filters": filters}).status_code == 400
@@ -0,0 +1,40 @@
+import logging
+
+import pytest
+from flask import Flask
+
+from monitoring import profiling
+from monitoring.metrics import observe_callback
+from routes import admin
+
+
+@observe_callback
+def update_profiled_chart():
+    return None
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    server = Flask(__name__)
+    admin.register_admin_routes(server)
+    yield server.test_client()
+    profiling.arm("update_profiled_chart", 0)
+
+
+def test_malformed_profile_entries_are_skipped(caplog):
+    with caplog.at_level(logging.WARNING, logger="monitoring.profiling"):
+        requests = profiling.parse_requests("update_overview:x, update_steward_stats:3, :2, update_races")
+    assert requests == {"update_steward_stats": 3, "update_races": 1}
+    assert "update_overview:x" in caplog.text
+
+
+def test_profile_route_rejects_unknown_callbacks(client):
+    headers = {"X-Admin-Token": "secret"}
+    response = client.post("/admin/profile?callback=no_such_callback", headers=headers)
+    assert response.status_code == 400
+    assert "no_such_callback" not in profiling.ARMED
+
+    response = client.post("/admin/profile?callback=update_profiled_chart&count=2", headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()["armed"]["update_profiled_chart"] == 2
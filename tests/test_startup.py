@@ -0,0 +1,40 @@
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from data import loader
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_import_leaves_logging_alone():
+    probe = "import logging, app; print(len(logging.getLogger().handlers))"
+    result = subprocess.run(
+        [sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.strip().splitlines()[-1] == "0"
+
+
+def test_lazy_indexes_build_once(monkeypatch):
+    dataset = loader.load_dataset()
+    fresh = loader.Dataset(dataset.df, dataset.version, dataset.memberships)
+    calls = []
+    build = loader.IncidentIndex.build
+
+    def slow_build(df):
+        calls.append(df)
+        time.sleep(0.05)
+        return build(df)
+
+    monkeypatch.setattr(loader.IncidentIndex, "build", slow_build)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(fresh.incidents)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)